@@ -1,8 +1,10 @@
-from . import config
-from . import quarantine
-from . import report
-from . import scanner
-from . import scheduler
-from . import updater
-from . import yara_manager
-from . import utils
+import importlib
+
+_SUBMODULES = ("config", "quarantine", "report", "scanner", "scheduler", "updater", "yara_manager", "utils")
+
+
+def __getattr__(name):
+
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
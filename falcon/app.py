@@ -27,7 +27,7 @@ from textual.widgets import Checkbox
 from .report import ReportManager
 from .tui_integration import (
     ScannerAdapter, QuarantineAdapter, UpdaterAdapter, SchedulerAdapter,
-    ScanState, TUIEventHandler
+    ScanState, TUIEventHandler, EVENT_QUEUE_MAXSIZE
 )
 
 logger = logging.getLogger(__name__)
@@ -93,15 +93,15 @@ class MatchesTableWidget(Static):
     def __init__(self):
         super().__init__()
         self.matches: List[Dict[str, Any]] = []
+        self.table = DataTable(id="matches-table")
 
     def compose(self) -> ComposeResult:
-        table = DataTable(id="matches-table")
-        table.add_columns("ID", "File", "Rule", "Severity", "Time")
-        yield table
+        self.table.add_columns("ID", "File", "Rule", "Severity", "Time")
+        yield self.table
 
     def add_match(self, match: Dict[str, Any]) -> None:
         self.matches.append(match)
-        table = self.query_one("#matches-table", DataTable)
+        table = self.table
 
         severity = match.get("severity", "medium")
         severity_style = {
@@ -123,8 +123,7 @@ class MatchesTableWidget(Static):
         )
 
     def clear_matches(self) -> None:
-        table = self.query_one("#matches-table", DataTable)
-        table.clear()
+        self.table.clear()
         self.matches = []
 
 class LogViewerWidget(Static):
@@ -842,7 +841,7 @@ class FalconDefenderApp:
         scheduled_tasks.register_instance("yara_manager", self.yara_manager)
         scheduled_tasks.register_instance("report_manager", self.report_manager)
 
-        self.event_queue: asyncio.Queue = asyncio.Queue()
+        self.event_queue: asyncio.Queue = asyncio.Queue(maxsize=EVENT_QUEUE_MAXSIZE)
 
         self.scanner_adapter = ScannerAdapter(self.scanner, self.event_queue)
         self.scheduler_adapter = SchedulerAdapter(self.scheduler_manager, self.scanner, self.updater, self.event_queue)
@@ -993,44 +992,65 @@ class MainApp(App):
         asyncio.create_task(self._watch_events())
 
     async def _watch_events(self) -> None:
+        queue = self.tui.event_queue
         while True:
-            try:
-                event = await asyncio.wait_for(self.tui.event_queue.get(), timeout=0.1)
-
-                if event.get("type") == "progress":
-                    data = event.get("data", {})
-                    self.stats_widget.scanned = data.get("scanned", 0)
-                    self.stats_widget.total = data.get("total", 1)
-                    self.stats_widget.files_per_sec = data.get("files_per_sec", 0.0)
-                    self.stats_widget.elapsed = data.get("elapsed", 0.0)
-
-                elif event.get("type") == "match":
-                    data = event.get("data", {})
-                    self.matches_widget.add_match(data)
-                    self.stats_widget.matches += 1
-                    self.log_widget.add_log(
-                        "Threat detected: " + data.get("file", "unknown") + " (" + data.get("rule", "unknown") + ")",
-                        "WARNING"
-                    )
-
-                elif event.get("type") == "info":
-                    msg = event.get("data", {}).get("msg", "")
-                    self.log_widget.add_log(msg, "INFO")
-
-                elif event.get("type") == "error":
-                    msg = event.get("data", {}).get("msg", "")
-                    self.log_widget.add_log(msg, "ERROR")
-                    self.logo_widget.state = ScanState.ERROR.value
-
-                elif event.get("type") == "done":
-                    msg = event.get("data", {}).get("msg", "")
-                    self.log_widget.add_log(msg, "INFO")
-                    self.logo_widget.state = ScanState.IDLE.value
-
-            except asyncio.TimeoutError:
-                continue
-            except Exception as e:
-                logger.error(f"Error watching events: {e}")
+            events = [await queue.get()]
+            # Drain whatever else is already queued without yielding to the loop per event.
+            while True:
+                try:
+                    events.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            self._apply_batch(events)
+
+    def _apply_batch(self, events: List[Dict[str, Any]]) -> None:
+
+        # One repaint for the whole drained batch instead of one per added row or log line.
+        with self.batch_update():
+            for event in events:
+                try:
+                    self._handle_event(event)
+                except Exception as e:
+                    logger.error(f"Error watching events: {e}")
+
+    def _handle_event(self, event: Dict[str, Any]) -> None:
+        event_type = event.get("type", "")
+        if event_type.endswith("_batch"):
+            base_type = event_type[:-len("_batch")]
+            for data in event.get("data", []):
+                self._handle_event({"type": base_type, "data": data})
+
+        elif event.get("type") == "progress":
+            data = event.get("data", {})
+            self.stats_widget.scanned = data.get("scanned", 0)
+            self.stats_widget.total = data.get("total", 1)
+            self.stats_widget.files_per_sec = data.get("files_per_sec", 0.0)
+            self.stats_widget.elapsed = data.get("elapsed", 0.0)
+
+        elif event.get("type") == "match":
+            self._add_match(event.get("data", {}))
+
+        elif event.get("type") == "info":
+            msg = event.get("data", {}).get("msg", "")
+            self.log_widget.add_log(msg, "INFO")
+
+        elif event.get("type") == "error":
+            msg = event.get("data", {}).get("msg", "")
+            self.log_widget.add_log(msg, "ERROR")
+            self.logo_widget.state = ScanState.ERROR.value
+
+        elif event.get("type") == "done":
+            msg = event.get("data", {}).get("msg", "")
+            self.log_widget.add_log(msg, "INFO")
+            self.logo_widget.state = ScanState.IDLE.value
+
+    def _add_match(self, data: Dict[str, Any]) -> None:
+        self.matches_widget.add_match(data)
+        self.stats_widget.matches += 1
+        self.log_widget.add_log(
+            "Threat detected: " + data.get("file", "unknown") + " (" + data.get("rule", "unknown") + ")",
+            "WARNING"
+        )
 
     def action_show_settings(self) -> None:
         def settings_callback(saved: bool) -> None:
@@ -1210,7 +1230,7 @@ class MainApp(App):
             self.log_widget.add_log(f"Rule update error: {e}", "ERROR")
             self.notify(f"Update error: {e}", title="Update Error", severity="error")
         finally:
-            current_state = await self.tui.scanner_adapter.status()
+            current_state = self.tui.scanner_adapter.status()
             if current_state["state"] == ScanState.UPDATING.value:
                 self.logo_widget.state = ScanState.IDLE.value
 
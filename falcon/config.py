@@ -34,6 +34,8 @@ class ConfigManager:
             "blocked_extensions": [".tmp", ".log", ".bak"],
             "allowed_extensions": [],
             "yara_timeout": 60,
+            "updater_threads": None,
+            "max_rule_file_size_mb": 16,
             "quarantine_dir": str(get_quarantine_path()),
             "rules_dir": str(get_rules_path()),
             "report_dir": str(get_report_path()),
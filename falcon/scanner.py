@@ -6,14 +6,26 @@ from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 import json
 import time
+import itertools
+import yara
 from datetime import datetime
 
 from .config import ConfigManager
-from .yara_manager import YaraManager
+from .yara_manager import YaraManager, RulePrefilter
 from .quarantine import QuarantineManager
+from .utils import get_physical_core_cpus
 
 logger = logging.getLogger(__name__)
 
+
+def _pin_worker_to_core(core_cpus: List[int], counter: "itertools.count") -> None:
+
+    cpu = core_cpus[next(counter) % len(core_cpus)]
+    try:
+        os.sched_setaffinity(0, {cpu})
+    except OSError as e:
+        logger.debug(f"Could not pin scanner worker to CPU {cpu}: {e}")
+
 class ScanResult:
     def __init__(self, file_path: Path, matches: List[Dict[str, Any]], error: Optional[str] = None):
         self.file_path = file_path
@@ -33,8 +45,7 @@ class Scanner:
         self.config = config_manager
         self.yara_manager = yara_manager
         self.quarantine_manager = quarantine_manager
-        self.rules = self.yara_manager.get_rules()
-        self.executor = ThreadPoolExecutor(max_workers=self.config.get("scanner_threads"))
+        self.executor = self._create_executor()
         self.last_scan_times: Dict[Path, float] = {}
         self.report_dir = Path(self.config.get("report_dir"))
         self.report_dir.mkdir(parents=True, exist_ok=True)
@@ -43,6 +54,20 @@ class Scanner:
         self.cancel_event = asyncio.Event()
         self.scan_start_time: Optional[datetime] = None
 
+    def _create_executor(self) -> ThreadPoolExecutor:
+
+        max_workers = self.config.get("scanner_threads")
+        core_cpus = get_physical_core_cpus()
+        if not core_cpus:
+            return ThreadPoolExecutor(max_workers=max_workers)
+        max_workers = min(max_workers, len(core_cpus)) if max_workers else len(core_cpus)
+        logger.debug(f"Using {max_workers} scanner workers pinned to CPUs {core_cpus[:max_workers]}.")
+        return ThreadPoolExecutor(
+            max_workers=max_workers,
+            initializer=_pin_worker_to_core,
+            initargs=(core_cpus[:max_workers], itertools.count()),
+        )
+
     def _is_file_scannable(self, file_path: Path) -> bool:
 
         if not file_path.is_file():
@@ -75,17 +100,24 @@ class Scanner:
 
         return True
 
-    def _scan_file(self, file_path: Path, quarantine_matches: bool) -> List[Dict[str, Any]]:
+    def _scan_file(self, file_path: Path, quarantine_matches: bool, rules: Optional[yara.Rules], prefilter: RulePrefilter) -> List[Dict[str, Any]]:
 
         matches_found = []
         if not self._is_file_scannable(file_path):
             return matches_found
 
         try:
-            if self.rules is None:
-                logger.warning("YARA rules not loaded. Skipping scan for {file_path}.")
+            if rules is None:
+                logger.warning(f"YARA rules not loaded. Skipping scan for {file_path}.")
                 return matches_found
-            yara_matches = self.rules.match(filepath=str(file_path), timeout=self.config.get("yara_timeout"))
+            if prefilter:
+                with open(file_path, "rb") as f:
+                    header = f.read(prefilter.header_size)
+                    file_size = os.fstat(f.fileno()).st_size
+                if not prefilter.any_applicable(file_size, header):
+                    logger.debug(f"Skipping {file_path}: no loaded rule applies to its size or magic bytes.")
+                    return matches_found
+            yara_matches = rules.match(filepath=str(file_path), timeout=self.config.get("yara_timeout"))
             for match in yara_matches:
                 match_info = {
                     "file_path": str(file_path),
@@ -143,7 +175,8 @@ class Scanner:
             logger.error(f"Path does not exist or is not a file/directory: {target_path}")
             return {"scanned_path": str(target_path), "total_files_scanned": 0, "matches": []}
 
-        futures = [self.executor.submit(self._scan_file, file_path, quarantine_matches) for file_path in files_to_scan]
+        rules, prefilter = self.yara_manager.get_rule_snapshot()
+        futures = [self.executor.submit(self._scan_file, file_path, quarantine_matches, rules, prefilter) for file_path in files_to_scan]
 
         for future in futures:
             total_files_scanned += 1
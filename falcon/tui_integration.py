@@ -1,7 +1,9 @@
 import asyncio
 import logging
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Callable
+from typing import Optional, Dict, Any, List, Callable, Tuple
 from datetime import datetime
 from enum import Enum
 
@@ -14,6 +16,51 @@ from .yara_manager import YaraManager
 
 logger = logging.getLogger(__name__)
 
+EVENT_QUEUE_MAXSIZE = 2048
+MATCH_BATCH_SIZE = 100
+EVENT_BATCH_INTERVAL = 0.016
+
+
+async def put_many(queue: asyncio.Queue, events: List[Dict[str, Any]]) -> None:
+
+    for event in events:
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            await queue.put(event)
+
+
+class EventBatcher:
+
+    def __init__(self, queue: asyncio.Queue, interval: float = EVENT_BATCH_INTERVAL):
+        self.queue = queue
+        self.interval = interval
+        self._pending: List[Tuple[str, List[Any]]] = []
+        self._flusher_task: Optional[asyncio.Task] = None
+
+    def add(self, event: Dict[str, Any]) -> None:
+
+        event_type = event["type"]
+        if self._pending and self._pending[-1][0] == event_type:
+            self._pending[-1][1].append(event.get("data"))
+        else:
+            self._pending.append((event_type, [event.get("data")]))
+        if self._flusher_task is None or self._flusher_task.done():
+            self._flusher_task = asyncio.get_event_loop().create_task(self._flusher())
+
+    async def _flusher(self) -> None:
+
+        while self._pending:
+            await asyncio.sleep(self.interval)
+            pending, self._pending = self._pending, []
+            events = []
+            for event_type, payloads in pending:
+                if len(payloads) == 1:
+                    events.append({"type": event_type, "data": payloads[0]})
+                else:
+                    events.append({"type": f"{event_type}_batch", "data": payloads})
+            await put_many(self.queue, events)
+
 
 class ScanState(Enum):
     IDLE = "Idle"
@@ -28,6 +75,7 @@ class QuarantineAdapter:
     def __init__(self, quarantine_manager: QuarantineManager, event_queue: asyncio.Queue):
         self.quarantine_manager = quarantine_manager
         self.event_queue = event_queue
+        self._batcher = EventBatcher(event_queue)
 
     async def list_quarantined(self) -> List[Dict[str, Any]]:
         loop = asyncio.get_event_loop()
@@ -45,12 +93,12 @@ class QuarantineAdapter:
         )
         
         if result:
-            await self.event_queue.put({
+            self._batcher.add({
                 "type": "info",
                 "data": {"msg": f"File {record_id} restored successfully"}
             })
         else:
-            await self.event_queue.put({
+            self._batcher.add({
                 "type": "error",
                 "data": {"msg": f"Failed to restore file {record_id}"}
             })
@@ -66,12 +114,12 @@ class QuarantineAdapter:
         )
         
         if result:
-            await self.event_queue.put({
+            self._batcher.add({
                 "type": "info",
                 "data": {"msg": f"File {record_id} deleted successfully"}
             })
         else:
-            await self.event_queue.put({
+            self._batcher.add({
                 "type": "error",
                 "data": {"msg": f"Failed to delete file {record_id}"}
             })
@@ -85,6 +133,7 @@ class UpdaterAdapter:
         self.updater = updater
         self.yara_manager = yara_manager
         self.event_queue = event_queue
+        self._net_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="upd")
 
     async def update_rules(self, source_url: str, expected_checksum: Optional[str] = None) -> bool:
         await self.event_queue.put({
@@ -94,16 +143,11 @@ class UpdaterAdapter:
 
         loop = asyncio.get_event_loop()
         try:
-            result = await loop.run_in_executor(
-                None,
-                self.updater.update_rules,
-                source_url,
-                expected_checksum
-            )
+            result = await self.updater.update_rules_async(source_url, expected_checksum, self._net_pool)
 
             if result:
                 await loop.run_in_executor(
-                    None,
+                    self._net_pool,
                     self.yara_manager.load_rules,
                     True
                 )
@@ -138,7 +182,7 @@ class UpdaterAdapter:
         loop = asyncio.get_event_loop()
         try:
             result = await loop.run_in_executor(
-                None,
+                self._net_pool,
                 self.updater.update_program,
                 source_url,
                 expected_checksum
@@ -166,22 +210,38 @@ class UpdaterAdapter:
             return False
 
 
+class ScanStats:
+
+    __slots__ = ("scanned", "total", "matches", "files_per_sec", "elapsed")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.scanned = 0
+        self.total = 0
+        self.matches = 0
+        self.files_per_sec = 0.0
+        self.elapsed = 0.0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
 class ScannerAdapter:
 
     def __init__(self, scanner: Scanner, event_queue: asyncio.Queue):
         self.scanner = scanner
         self.event_queue = event_queue
+        self._io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="scan")
         self.state = ScanState.IDLE
         self.pause_event = asyncio.Event()
         self.cancel_event = asyncio.Event()
         self.scan_task: Optional[asyncio.Task] = None
-        self.stats = {
-            "scanned": 0,
-            "total": 0,
-            "matches": 0,
-            "files_per_sec": 0.0,
-            "elapsed": 0.0,
-        }
+        self.stats = ScanStats()
         self.scan_start_time: Optional[datetime] = None
 
     async def start_scan(
@@ -200,7 +260,7 @@ class ScannerAdapter:
         self.state = ScanState.SCANNING
         self.pause_event.clear()
         self.cancel_event.clear()
-        self.stats = {"scanned": 0, "total": 0, "matches": 0, "files_per_sec": 0.0, "elapsed": 0.0}
+        self.stats.reset()
         self.scan_start_time = datetime.now()
 
         await self.event_queue.put({
@@ -225,7 +285,7 @@ class ScannerAdapter:
 
             loop = asyncio.get_event_loop()
             result = await loop.run_in_executor(
-                None,
+                self._io_pool,
                 self.scanner.scan_path,
                 path,
                 incremental,
@@ -233,38 +293,48 @@ class ScannerAdapter:
             )
 
             elapsed = (datetime.now() - self.scan_start_time).total_seconds()
-            self.stats["elapsed"] = elapsed
-            self.stats["scanned"] = result.get("total_files_scanned", 0)
-            self.stats["total"] = result.get("total_files_scanned", 0)
-            self.stats["matches"] = len(result.get("matches", []))
+            stats = self.stats
+            stats.elapsed = elapsed
+            stats.scanned = result.get("total_files_scanned", 0)
+            stats.total = result.get("total_files_scanned", 0)
+            stats.matches = len(result.get("matches", []))
 
             if elapsed > 0:
-                self.stats["files_per_sec"] = self.stats["scanned"] / elapsed
+                stats.files_per_sec = stats.scanned / elapsed
             else:
-                self.stats["files_per_sec"] = 0.0
-
-            for match in result.get("matches", []):
-                await self.event_queue.put({
-                    "type": "match",
-                    "data": {
-                        "id": hash(match.get("file_path", "")),
-                        "file": match.get("file_path"),
-                        "rule": match.get("rule_name"),
-                        "severity": self._get_severity(match),
-                        "sha256": match.get("file_hash", "N/A"),
-                        "timestamp": datetime.now().isoformat(),
-                        "match_info": match,
-                    }
-                })
+                stats.files_per_sec = 0.0
+
+            matches = result.get("matches", [])
+            get_severity = self._get_severity
+            timestamp = datetime.now().isoformat()
+            match_events = [
+                {
+                    "id": zlib.crc32(match.get("file_path", "").encode("utf-8", "surrogatepass")),
+                    "file": match.get("file_path"),
+                    "rule": match.get("rule_name"),
+                    "severity": get_severity(match),
+                    "sha256": match.get("file_hash", "N/A"),
+                    "timestamp": timestamp,
+                    "match_info": match,
+                }
+                for match in matches
+            ]
+            await put_many(self.event_queue, [
+                {"type": "match_batch", "data": match_events[i:i + MATCH_BATCH_SIZE]}
+                for i in range(0, len(match_events), MATCH_BATCH_SIZE)
+            ])
 
             await self.event_queue.put({
                 "type": "progress",
-                "data": self.stats.copy()
+                "data": self.stats
             })
 
             await self.event_queue.put({
                 "type": "done",
-                "data": {"msg": f"Scan completed. Found {self.stats['matches']} threats in {elapsed:.1f}s"}
+                "data": {
+                    "msg": f"Scan completed. Found {self.stats.matches} threats in {elapsed:.1f}s",
+                    "stats": self.stats.as_dict(),
+                }
             })
 
             self.state = ScanState.IDLE
@@ -321,7 +391,7 @@ class ScannerAdapter:
 
         return {
             "state": self.state.value,
-            **self.stats
+            **self.stats.as_dict()
         }
 
     @staticmethod
@@ -340,25 +410,48 @@ class ScannerAdapter:
 class TUIEventHandler:
 
     def __init__(self):
-        self.event_handlers: Dict[str, List[Callable]] = {}
+        self._sync_handlers: Dict[str, List[Callable]] = {}
+        self._async_handlers: Dict[str, List[Callable]] = {}
 
     def register_handler(self, event_type: str, handler: Callable) -> None:
 
-        if event_type not in self.event_handlers:
-            self.event_handlers[event_type] = []
-        self.event_handlers[event_type].append(handler)
+        if asyncio.iscoroutinefunction(handler):
+            self._async_handlers.setdefault(event_type, []).append(handler)
+        else:
+            self._sync_handlers.setdefault(event_type, []).append(handler)
 
     async def emit(self, event_type: str, data: Dict[str, Any]) -> None:
 
-        if event_type in self.event_handlers:
-            for handler in self.event_handlers[event_type]:
-                try:
-                    if asyncio.iscoroutinefunction(handler):
-                        await handler(data)
-                    else:
-                        handler(data)
-                except Exception as e:
-                    logger.error(f"Error in event handler for {event_type}: {e}")
+        for handler in self._sync_handlers.get(event_type, ()):
+            try:
+                handler(data)
+            except Exception as e:
+                logger.error(f"Error in event handler for {event_type}: {e}")
+
+        async_handlers = self._async_handlers.get(event_type)
+        if async_handlers:
+            results = await asyncio.gather(*(handler(data) for handler in async_handlers), return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error(f"Error in event handler for {event_type}: {result}")
+
+
+def _build_job_list(scheduler_manager: SchedulerManager) -> List[Dict[str, Any]]:
+
+    job_list = []
+    for job in scheduler_manager.get_jobs():
+        try:
+            next_run = job.next_run_time.isoformat() if job.next_run_time else "N/A"
+        except Exception:
+            next_run = "Error calculating"
+        job_list.append({
+            "id": job.id,
+            "name": job.name,
+            "trigger": str(job.trigger),
+            "next_run_time": next_run,
+            "func_name": job.func.__name__ if hasattr(job.func, '__name__') else str(job.func)
+        })
+    return job_list
 
 
 class SchedulerAdapter:
@@ -368,29 +461,17 @@ class SchedulerAdapter:
         self.scanner = scanner
         self.updater = updater
         self.event_queue = event_queue
+        self._batcher = EventBatcher(event_queue)
+        self._io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="sched")
 
     async def list_jobs(self) -> List[Dict[str, Any]]:
 
         loop = asyncio.get_event_loop()
         try:
-            jobs = await loop.run_in_executor(None, self.scheduler_manager.get_jobs)
-            job_list = []
-            for job in jobs:
-                try:
-                    next_run = job.next_run_time.isoformat() if job.next_run_time else "N/A"
-                except Exception:
-                    next_run = "Error calculating"
-                job_list.append({
-                    "id": job.id,
-                    "name": job.name,
-                    "trigger": str(job.trigger),
-                    "next_run_time": next_run,
-                    "func_name": job.func.__name__ if hasattr(job.func, '__name__') else str(job.func)
-                })
-            return job_list
+            return await loop.run_in_executor(self._io_pool, _build_job_list, self.scheduler_manager)
         except Exception as e:
             logger.error(f"Error listing scheduled jobs: {e}")
-            await self.event_queue.put({
+            self._batcher.add({
                 "type": "error",
                 "data": {"msg": f"Failed to list scheduled jobs: {e}"}
             })
@@ -401,15 +482,15 @@ class SchedulerAdapter:
 
         loop = asyncio.get_event_loop()
         try:
-            await loop.run_in_executor(None, self.scheduler_manager.remove_job, job_id)
-            await self.event_queue.put({
+            await loop.run_in_executor(self._io_pool, self.scheduler_manager.remove_job, job_id)
+            self._batcher.add({
                 "type": "info",
                 "data": {"msg": f"Scheduled job '{job_id}' removed successfully"}
             })
             return True
         except Exception as e:
             logger.error(f"Error removing scheduled job '{job_id}': {e}")
-            await self.event_queue.put({
+            self._batcher.add({
                 "type": "error",
                 "data": {"msg": f"Failed to remove job '{job_id}': {e}"}
             })
@@ -443,11 +524,11 @@ class SchedulerAdapter:
                     raise thread_e
 
             await loop.run_in_executor(
-                None,
+                self._io_pool,
                 add_job_in_thread
             )
 
-            await self.event_queue.put({
+            self._batcher.add({
                 "type": "info",
                 "data": {"msg": f"Scheduled task '{task_data['name']}' added successfully"}
             })
@@ -455,7 +536,7 @@ class SchedulerAdapter:
 
         except Exception as e:
             logger.error(f"Error adding scheduled job '{task_data.get('name', 'unknown')}': {e}")
-            await self.event_queue.put({
+            self._batcher.add({
                 "type": "error",
                 "data": {"msg": f"Failed to add job '{task_data.get('name', 'unknown')}': {e}"}
             })
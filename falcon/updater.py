@@ -1,47 +1,139 @@
 import os
+import sys
+import json
+import asyncio
 import hashlib
-import requests
-import yara
 import logging
-import zipfile
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import aiohttp
+
+from .utils import RULE_FILE_EXTENSIONS, scandir_rule_files
 
 logger = logging.getLogger(__name__)
 
+CHECKSUM_BUFFER_SIZE = 1024 * 1024
+MAX_DOWNLOAD_CONNECTIONS = 10
+ZIP_EXTRACT_WORKERS = 4
+MAX_UPDATE_WORKERS = 10
+
+
+def _fast_copy(source_path: Path, dest_path: Path) -> None:
+
+    if not sys.platform.startswith("linux"):
+        shutil.copy2(source_path, dest_path)
+        return
+    st = source_path.stat()
+    try:
+        with open(source_path, 'rb') as src, open(dest_path, 'wb') as dst:
+            offset = 0
+            while offset < st.st_size:
+                sent = os.sendfile(dst.fileno(), src.fileno(), offset, st.st_size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+    except OSError as e:
+        logger.debug(f"sendfile copy of {source_path} failed ({e}); falling back to shutil.copy2.")
+        shutil.copy2(source_path, dest_path)
+        return
+    shutil.copystat(source_path, dest_path)
+
 class Updater:
 
     def __init__(self, rules_dir: Path, config_manager: Any = None):
         self.rules_dir = rules_dir
         self.rules_dir.mkdir(parents=True, exist_ok=True)
         self.config_manager = config_manager
+        self._ck_cache: Dict[Path, Tuple[int, int, str]] = {}
+        self.compile_cache_path = self.rules_dir / ".compile_cache.json"
+        self._compile_cache: Dict[str, Dict[str, Any]] = {}
+
+    def _download_file(self, url: str, destination_path: Path, expected_checksum: Optional[str] = None) -> bool:
 
-    def _download_file(self, url: str, destination_path: Path) -> bool:
+        import requests
 
         try:
             response = requests.get(url, stream=True, timeout=10)
             response.raise_for_status()
+            hasher = hashlib.sha256()
             with open(destination_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
+                for chunk in response.iter_content(chunk_size=CHECKSUM_BUFFER_SIZE):
                     f.write(chunk)
+                    hasher.update(chunk)
             logger.info(f"Successfully downloaded {url} to {destination_path}")
-            return True
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to download {url}: {e}")
             return False
+        return self._verify_download(destination_path, hasher.hexdigest(), expected_checksum)
+
+    async def _download_file_async(self, session: "aiohttp.ClientSession", url: str, destination_path: Path,
+                                   expected_checksum: Optional[str] = None) -> bool:
+
+        import aiohttp
+
+        try:
+            timeout = aiohttp.ClientTimeout(sock_connect=10, sock_read=10)
+            async with session.get(url, timeout=timeout) as response:
+                response.raise_for_status()
+                hasher = hashlib.sha256()
+                with open(destination_path, 'wb') as f:
+                    async for chunk in response.content.iter_chunked(CHECKSUM_BUFFER_SIZE):
+                        f.write(chunk)
+                        hasher.update(chunk)
+            logger.info(f"Successfully downloaded {url} to {destination_path}")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Failed to download {url}: {e}")
+            return False
+        return self._verify_download(destination_path, hasher.hexdigest(), expected_checksum)
+
+    def _verify_download(self, destination_path: Path, actual_checksum: str, expected_checksum: Optional[str]) -> bool:
+
+        if expected_checksum:
+            if actual_checksum != expected_checksum:
+                logger.error(f"Checksum mismatch for {destination_path.name}. Expected {expected_checksum}, got {actual_checksum}")
+                destination_path.unlink(missing_ok=True)
+                return False
+            logger.info(f"Checksum validated successfully for {destination_path.name}.")
+        return True
 
     def _calculate_checksum(self, file_path: Path) -> str:
 
-        hasher = hashlib.sha256()
         with open(file_path, 'rb') as f:
+            if hasattr(hashlib, "file_digest"):
+                return hashlib.file_digest(f, 'sha256').hexdigest()
+            hasher = hashlib.sha256()
+            buffer = memoryview(bytearray(CHECKSUM_BUFFER_SIZE))
             while True:
-                chunk = f.read(8192)
-                if not chunk:
+                read = f.readinto(buffer)
+                if not read:
                     break
-                hasher.update(chunk)
+                hasher.update(buffer[:read])
         return hasher.hexdigest()
 
+    def _cached_checksum(self, file_path: Path) -> str:
+
+        st = file_path.stat()
+        cached = self._ck_cache.get(file_path)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        checksum = self._calculate_checksum(file_path)
+        self._ck_cache[file_path] = (st.st_mtime_ns, st.st_size, checksum)
+        return checksum
+
+    def _needs_copy(self, source_path: Path, dest_path: Path) -> bool:
+
+        try:
+            dest_size = dest_path.stat().st_size
+        except FileNotFoundError:
+            return True
+        if source_path.stat().st_size != dest_size:
+            return True
+        return self._cached_checksum(source_path) != self._cached_checksum(dest_path)
+
     def _validate_checksum(self, file_path: Path, expected_checksum: str) -> bool:
 
         actual_checksum = self._calculate_checksum(file_path)
@@ -53,9 +145,25 @@ class Updater:
 
     def _extract_zip_bundle(self, zip_path: Path, destination_dir: Path) -> bool:
 
+        import zipfile
+
         try:
             with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(destination_dir)
+                members = [
+                    m for m in zip_ref.infolist()
+                    if not m.is_dir() and m.filename.endswith(RULE_FILE_EXTENSIONS)
+                ]
+                # ZipFile.extract does not tolerate another thread creating the same parent
+                # directory, so the first member of each directory is extracted up front.
+                first_members, other_members, seen_dirs = [], [], set()
+                for member in members:
+                    parent = member.filename.replace("\\", "/").rpartition("/")[0]
+                    (other_members if parent in seen_dirs else first_members).append(member)
+                    seen_dirs.add(parent)
+                for member in first_members:
+                    zip_ref.extract(member, destination_dir)
+                with ThreadPoolExecutor(max_workers=ZIP_EXTRACT_WORKERS, thread_name_prefix="unzip") as executor:
+                    list(executor.map(lambda m: zip_ref.extract(m, destination_dir), other_members))
             logger.info(f"Successfully extracted {zip_path} to {destination_dir}")
             return True
         except zipfile.BadZipFile:
@@ -65,6 +173,75 @@ class Updater:
             logger.error(f"Error extracting zip file {zip_path}: {e}")
             return False
 
+    def _get_update_workers(self) -> int:
+
+        workers = self.config_manager.get("updater_threads") if self.config_manager else None
+        return workers or min(MAX_UPDATE_WORKERS, os.cpu_count() or 1)
+
+    def _load_compile_cache(self) -> None:
+
+        try:
+            with open(self.compile_cache_path, 'r') as f:
+                self._compile_cache = json.load(f)
+        except FileNotFoundError:
+            self._compile_cache = {}
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Could not read rule compile cache {self.compile_cache_path}: {e}. Starting fresh.")
+            self._compile_cache = {}
+
+    def _save_compile_cache(self) -> None:
+
+        tmp_path = self.compile_cache_path.with_name(self.compile_cache_path.name + ".tmp")
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self._compile_cache, f)
+            os.replace(tmp_path, self.compile_cache_path)
+        except OSError as e:
+            logger.warning(f"Could not save rule compile cache {self.compile_cache_path}: {e}")
+
+    def _compiled_before(self, source_path: Path, label: str) -> bool:
+
+        entry = self._compile_cache.get(label)
+        if not entry:
+            return False
+        st = source_path.stat()
+        if entry.get("size") != st.st_size:
+            return False
+        return entry.get("mtime_ns") == st.st_mtime_ns or entry.get("sha256") == self._cached_checksum(source_path)
+
+    def _install_rule(self, source_path: Path, dest_path: Path, label: str) -> Tuple[int, str]:
+
+        import yara
+
+        try:
+            dest_path.parent.mkdir(parents=True, exist_ok=True)
+            if not self._compiled_before(source_path, label):
+                yara.compile(filepath=str(source_path))
+                st = source_path.stat()
+                self._compile_cache[label] = {
+                    "size": st.st_size,
+                    "mtime_ns": st.st_mtime_ns,
+                    "sha256": self._cached_checksum(source_path),
+                }
+            if self._needs_copy(source_path, dest_path):
+                _fast_copy(source_path, dest_path)
+                return logging.INFO, f"Copied/Updated YARA rule: {label}"
+            return logging.INFO, f"YARA rule {label} is already up to date."
+        except yara.Error as e:
+            return logging.ERROR, f"Invalid YARA rule {label}: {e}. Skipping."
+
+    def _install_rules(self, rule_files: List[Tuple[Path, Path, str]]) -> None:
+
+        if not rule_files:
+            return
+        self._load_compile_cache()
+        with ThreadPoolExecutor(max_workers=self._get_update_workers(), thread_name_prefix="rule-install") as executor:
+            for level, message in executor.map(lambda item: self._install_rule(*item), rule_files):
+                logger.log(level, message)
+        labels = {label for _, _, label in rule_files}
+        self._compile_cache = {label: entry for label, entry in self._compile_cache.items() if label in labels}
+        self._save_compile_cache()
+
     def update_rules(self, source_url: str, expected_checksum: Optional[str] = None) -> bool:
 
         logger.info(f"Attempting to update rules from: {source_url}")
@@ -81,23 +258,10 @@ class Updater:
 
                 if local_source_path.is_dir():
 
-                    yar_files = list(local_source_path.glob("*.yar"))
-                    yara_files = list(local_source_path.glob("*.yara"))
-
-                    for yar_file in yar_files + yara_files:
-
-                        try:
-
-                            yara.compile(filepath=str(yar_file))
-                            dest_file = self.rules_dir / yar_file.name
-                            current_checksum = self._calculate_checksum(dest_file) if dest_file.exists() else None
-                            if not dest_file.exists() or self._calculate_checksum(yar_file) != current_checksum:
-                                shutil.copy2(yar_file, dest_file)
-                                logger.info(f"Copied/Updated YARA rule: {yar_file.name}")
-                            else:
-                                logger.info(f"YARA rule {yar_file.name} is already up to date.")
-                        except yara.Error as e:
-                            logger.error(f"Invalid YARA rule {yar_file.name}: {e}. Skipping.")
+                    self._install_rules([
+                        (Path(entry.path), self.rules_dir / entry.name, entry.name)
+                        for entry in scandir_rule_files(local_source_path, recursive=False)
+                    ])
                     return True
                 elif local_source_path.suffix == ".zip":
 
@@ -111,11 +275,7 @@ class Updater:
             else:
 
                 temp_zip_path = temp_dir / "rules_bundle.zip"
-                if not self._download_file(source_url, temp_zip_path):
-                    return False
-
-                if expected_checksum and not self._validate_checksum(temp_zip_path, expected_checksum):
-                    temp_zip_path.unlink()
+                if not self._download_file(source_url, temp_zip_path, expected_checksum):
                     return False
 
                 if not self._extract_zip_bundle(temp_zip_path, temp_dir):
@@ -123,36 +283,40 @@ class Updater:
                     return False
                 temp_zip_path.unlink()
 
-            for root, _, files in os.walk(temp_dir):
-                for file in files:
-                    if file.endswith('.yar') or file.endswith('.yara'):
-                        source_file_path = Path(root) / file
+            rule_files = []
+            for entry in scandir_rule_files(temp_dir):
+                source_file_path = Path(entry.path)
 
-                        relative_path = source_file_path.relative_to(temp_dir)
+                relative_path = source_file_path.relative_to(temp_dir)
 
-                        dest_file_path = self.rules_dir / relative_path
+                rule_files.append((source_file_path, self.rules_dir / relative_path, str(relative_path)))
+            self._install_rules(rule_files)
+            return True
 
-                        try:
+        finally:
+            if temp_dir.exists():
+                shutil.rmtree(temp_dir)
 
-                            dest_file_path.parent.mkdir(parents=True, exist_ok=True)
+    async def update_rules_async(self, source_url: str, expected_checksum: Optional[str] = None,
+                                 executor: Optional[ThreadPoolExecutor] = None) -> bool:
 
-                            yara.compile(filepath=str(source_file_path))
+        import aiohttp
 
-                            current_checksum = self._calculate_checksum(
-                                dest_file_path) if dest_file_path.exists() else None
-                            if not dest_file_path.exists() or self._calculate_checksum(
-                                    source_file_path) != current_checksum:
-                                shutil.copy2(source_file_path, dest_file_path)
-                                logger.info(f"Copied/Updated YARA rule: {relative_path}")
-                            else:
-                                logger.info(f"YARA rule {relative_path} is already up to date.")
-                        except yara.Error as e:
-                            logger.error(f"Invalid YARA rule {relative_path}: {e}. Skipping.")
-            return True
+        loop = asyncio.get_running_loop()
+        if source_url.startswith("file://"):
+            return await loop.run_in_executor(executor, self.update_rules, source_url, expected_checksum)
 
+        logger.info(f"Attempting to download rules from: {source_url}")
+        download_dir = self.rules_dir.parent / ".temp_rules_download"
+        download_dir.mkdir(parents=True, exist_ok=True)
+        zip_path = download_dir / "rules_bundle.zip"
+        try:
+            async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=MAX_DOWNLOAD_CONNECTIONS)) as session:
+                if not await self._download_file_async(session, source_url, zip_path, expected_checksum):
+                    return False
+            return await loop.run_in_executor(executor, self.update_rules, f"file://{zip_path.absolute()}")
         finally:
-            if temp_dir.exists():
-                shutil.rmtree(temp_dir)
+            shutil.rmtree(download_dir, ignore_errors=True)
 
     def update_program(self, source_url: str, expected_checksum: Optional[str] = None) -> bool:
 
@@ -160,11 +324,7 @@ class Updater:
 
         download_path = Path.home() / Path(source_url).name
 
-        if not self._download_file(source_url, download_path):
-            return False
-
-        if expected_checksum and not self._validate_checksum(download_path, expected_checksum):
-            download_path.unlink()
+        if not self._download_file(source_url, download_path, expected_checksum):
             return False
 
         logger.info(f"Program update file downloaded to: {download_path}")
@@ -175,6 +335,8 @@ class Updater:
 
 
 if __name__ == "__main__":
+    import zipfile
+
     logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
     test_rules_dir = Path("./test_rules_update")
@@ -1,12 +1,31 @@
 import os
 import sys
 import platform
+import functools
 from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
 
+_SYSTEM = platform.system()
+
+RULE_FILE_EXTENSIONS = (".yar", ".yara")
+
+def scandir_rule_files(root, recursive: bool = True) -> Iterator[os.DirEntry]:
+    try:
+        with os.scandir(root) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        yield from scandir_rule_files(entry.path)
+                elif entry.name.endswith(RULE_FILE_EXTENSIONS) and entry.is_file():
+                    yield entry
+    except OSError:
+        return
+
+@functools.lru_cache(maxsize=8)
 def get_platform_specific_path(base_dir_name: str) -> Path:
-    if platform.system() == "Windows":
+    if _SYSTEM == "Windows":
         return Path(os.environ.get("APPDATA", Path.home() / "AppData" / "Roaming")) / base_dir_name
-    elif platform.system() == "Darwin":
+    elif _SYSTEM == "Darwin":
         return Path.home() / "Library" / "Application Support" / base_dir_name
     else:
 
@@ -15,15 +34,44 @@ def get_platform_specific_path(base_dir_name: str) -> Path:
             return Path(xdg_data_home) / base_dir_name
         return Path.home() / ".local" / "share" / base_dir_name
 
+def get_physical_core_cpus() -> List[int]:
+    if not hasattr(os, "sched_getaffinity"):
+        return []
+    try:
+        allowed = os.sched_getaffinity(0)
+        cores: Dict[Tuple[str, str], int] = {}
+        processor = physical_id = core_id = None
+        with open("/proc/cpuinfo", "r") as f:
+            for line in list(f) + [""]:
+                key, _, value = line.partition(":")
+                key, value = key.strip(), value.strip()
+                if key == "processor":
+                    processor = int(value)
+                elif key == "physical id":
+                    physical_id = value
+                elif key == "core id":
+                    core_id = value
+                elif not key:
+                    if processor is not None and processor in allowed:
+                        cores.setdefault((physical_id or str(processor), core_id or str(processor)), processor)
+                    processor = physical_id = core_id = None
+    except (OSError, ValueError):
+        return []
+    return sorted(cores.values())
+
+@functools.lru_cache(maxsize=1)
 def get_config_path() -> Path:
     return get_platform_specific_path("falcondefender") / "config.json"
 
+@functools.lru_cache(maxsize=1)
 def get_quarantine_path() -> Path:
     return get_platform_specific_path("falcondefender") / "quarantine"
 
+@functools.lru_cache(maxsize=1)
 def get_rules_path() -> Path:
     return get_platform_specific_path("falcondefender") / "rules"
 
+@functools.lru_cache(maxsize=1)
 def get_report_path() -> Path:
     return get_platform_specific_path("falcondefender") / "reports"
 
@@ -33,3 +81,4 @@ if __name__ == "__main__":
     print(f"Quarantine Path: {get_quarantine_path()}")
     print(f"Rules Path: {get_rules_path()}")
     print(f"Report Path: {get_report_path()}")
+    print(f"Physical core CPUs: {get_physical_core_cpus()}")
@@ -1,13 +1,72 @@
 import os
+import mmap
 import yara
 import logging
+import threading
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 from .config import ConfigManager
+from .utils import scandir_rule_files, RULE_FILE_EXTENSIONS
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
 
 logger = logging.getLogger(__name__)
 
+MMAP_HASH_THRESHOLD = 64 * 1024
+HASH_CHUNK_SIZE = 64 * 1024
+RULES_CHECKSUM_VERSION = "v2:"
+XXH3_CHECKSUM_VERSION = "xxh3:"
+RULES_WATCH_DEBOUNCE = 0.5
+RULES_WATCH_EVENT_TYPES = frozenset({"created", "modified", "deleted", "moved", "closed"})
+DEFAULT_MAX_RULE_FILE_SIZE_MB = 16
+
+
+def _hash_file_into(hasher, file_path: str) -> None:
+
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size > MMAP_HASH_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                hasher.update(mm)
+            return
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+
+
+def _new_rules_hasher():
+
+    if xxhash is not None:
+        return XXH3_CHECKSUM_VERSION, xxhash.xxh3_128()
+    return RULES_CHECKSUM_VERSION, hashlib.blake2b(digest_size=16)
+
+
+class RulePrefilter:
+
+    def __init__(self, hints: Optional[Dict[str, Tuple[Optional[int], Optional[bytes]]]] = None):
+        self.hints = hints or {}
+        self.header_size = max((len(m) for _, m in self.hints.values() if m), default=0)
+
+    def __bool__(self) -> bool:
+        return bool(self.hints)
+
+    def _applies(self, hint: Tuple[Optional[int], Optional[bytes]], file_size: int, header: bytes) -> bool:
+
+        max_filesize, magic = hint
+        if max_filesize is not None and file_size > max_filesize:
+            return False
+        return magic is None or header.startswith(magic)
+
+    def applicable_rules(self, file_size: int, header: bytes) -> Set[str]:
+        return {name for name, hint in self.hints.items() if self._applies(hint, file_size, header)}
+
+    def any_applicable(self, file_size: int, header: bytes) -> bool:
+        return any(self._applies(hint, file_size, header) for hint in self.hints.values())
+
+
 class YaraManager:
 
     def __init__(self, config_manager: ConfigManager):
@@ -18,51 +77,89 @@ class YaraManager:
         self.rules_dir.mkdir(parents=True, exist_ok=True)
         self._rules: Optional[yara.Rules] = None
         self._rules_checksum: Optional[str] = None
+        self._mtime_fingerprint: Optional[Tuple[Tuple[str, int, int], ...]] = None
+        self._prefilter = RulePrefilter()
+        self._snapshot: Tuple[Optional[yara.Rules], RulePrefilter] = (None, self._prefilter)
+        self._rule_count = 0
+        self._observer = None
+        self._reload_timer: Optional[threading.Timer] = None
+        self._reload_lock = threading.Lock()
+        self._load_lock = threading.RLock()
+        self._compile_pool: Optional[ThreadPoolExecutor] = None
         self.load_rules()
 
-    def _calculate_rules_checksum(self) -> str:
+    def _fast_fingerprint(self) -> Tuple[Tuple[str, int, int], ...]:
+
+        fingerprint = []
+        for entry in scandir_rule_files(self.rules_dir):
+            st = entry.stat()
+            fingerprint.append((entry.path, st.st_mtime_ns, st.st_size))
+        return tuple(sorted(fingerprint))
+
+    def _select_rule_files(self, fingerprint: Tuple[Tuple[str, int, int], ...]) -> List[str]:
+
+        max_size = (self.config.get("max_rule_file_size_mb") or DEFAULT_MAX_RULE_FILE_SIZE_MB) * 1024 * 1024
+        rule_file_paths = []
+        for path, _, size in fingerprint:
+            if size > max_size:
+                logger.warning(f"Skipping YARA rule file {path}: {size} bytes exceeds the max rule file size ({max_size} bytes).")
+                continue
+            rule_file_paths.append(path)
+        return rule_file_paths
 
-        hasher = hashlib.md5()
-        yar_files = list(self.rules_dir.rglob("*.yar"))
-        yara_files = list(self.rules_dir.rglob("*.yara"))
-        all_rule_files = sorted(yar_files + yara_files)
-        if not yar_files:
-            return ""
-        for file_path in yar_files:
-            with open(file_path, "rb") as f:
-                hasher.update(f.read())
-        return hasher.hexdigest()
+    def _calculate_rules_checksum(self, rule_file_paths: Optional[List[str]] = None) -> Tuple[str, List[str]]:
 
-    def _compile_rules(self) -> Optional[yara.Rules]:
+        checksum_version, hasher = _new_rules_hasher()
+        if rule_file_paths is None:
+            rule_file_paths = sorted(entry.path for entry in scandir_rule_files(self.rules_dir))
+        if not rule_file_paths:
+            return "", rule_file_paths
+        for file_path in rule_file_paths:
+            path_bytes = os.fsencode(os.path.relpath(file_path, self.rules_dir))
+            hasher.update(len(path_bytes).to_bytes(4, "little") + path_bytes)
+            _hash_file_into(hasher, file_path)
+        return f"{checksum_version}{hasher.hexdigest()}", rule_file_paths
+
+    def _compile_rules(self, rule_file_paths: List[str]) -> Optional[yara.Rules]:
 
-        yar_files = list(self.rules_dir.rglob("*.yar"))
-        yara_files = list(self.rules_dir.rglob("*.yara"))
-        rule_file_paths = sorted(yar_files + yara_files)
         if not rule_file_paths:
             logger.warning("No YARA rule files found for compilation.")
             return None
 
-        filepaths = {str(p.name): str(p) for p in rule_file_paths}
+        filepaths = {os.path.basename(p): p for p in rule_file_paths}
         try:
-            logger.info(f"Compiling rules from: {list(filepaths.keys())}")
-            compiled = yara.compile(filepaths=filepaths, error_on_warning=True)
-            if compiled is None or (isinstance(compiled, yara.Rules) and len(list(compiled)) == 0):
-                logger.error("YARA compilation resulted in an empty ruleset, indicating an issue with rule syntax or content.")
-
-                if self.compiled_rules_path.exists():
-                    self.compiled_rules_path.unlink()
-                if self.checksum_path.exists():
-                    self.checksum_path.unlink()
-                return None
-            return compiled
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Compiling rules from: %s", list(filepaths))
+            return yara.compile(filepaths=filepaths, error_on_warning=True)
         except yara.Error as e:
             logger.error(f"YARA compilation error: {e}")
             return None
 
+    def _get_compile_pool(self) -> ThreadPoolExecutor:
+
+        if self._compile_pool is None:
+            self._compile_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="yara-compile")
+        return self._compile_pool
+
     def load_rules(self, force_recompile: bool = False) -> None:
 
+        with self._load_lock:
+            self._load_rules(force_recompile)
+
+    def _load_rules(self, force_recompile: bool) -> None:
+
         self.rules_dir.mkdir(parents=True, exist_ok=True)
-        current_checksum = self._calculate_rules_checksum()
+        self._mtime_fingerprint = self._fast_fingerprint()
+        rule_file_paths = self._select_rule_files(self._mtime_fingerprint)
+        compile_future = None
+        cache_missing = not (self.compiled_rules_path.exists() and self.checksum_path.exists())
+        if force_recompile or (self._rules is None and cache_missing):
+            compile_future = self._get_compile_pool().submit(self._compile_rules, rule_file_paths)
+        current_checksum, rule_file_paths = self._calculate_rules_checksum(rule_file_paths)
+
+        if not force_recompile and self._rules is not None and current_checksum == self._rules_checksum:
+            logger.info("YARA rules already loaded and up to date.")
+            return
 
         if not force_recompile and self.compiled_rules_path.exists() and self.checksum_path.exists():
             stored_checksum = self.checksum_path.read_text()
@@ -70,45 +167,156 @@ class YaraManager:
                 try:
                     self._rules = yara.load(str(self.compiled_rules_path))
                     self._rules_checksum = current_checksum
+                    self._build_rule_prefilter()
                     logger.info("Loaded YARA rules from up-to-date compiled file.")
                     return
                 except yara.Error as e:
                     logger.warning(f"Could not load compiled YARA rules file: {e}. Recompiling.")
 
         logger.info("YARA rule source has changed or compiled file is missing. Recompiling...")
-        compiled_rules = self._compile_rules()
+        compiled_rules = compile_future.result() if compile_future else self._compile_rules(rule_file_paths)
         if compiled_rules:
             self._rules = compiled_rules
+            self._build_rule_prefilter()
+            if self._rule_count == 0:
+                logger.error("YARA compilation resulted in an empty ruleset, indicating an issue with rule syntax or content.")
+                compiled_rules = None
+        if compiled_rules:
             self._rules_checksum = current_checksum
             self._save_compiled_rules(self._rules, current_checksum)
         else:
             self._rules = None
             self._rules_checksum = None
-            if self.compiled_rules_path.exists():
-                self.compiled_rules_path.unlink()
-            if self.checksum_path.exists():
-                self.checksum_path.unlink()
+            self.compiled_rules_path.unlink(missing_ok=True)
+            self.checksum_path.unlink(missing_ok=True)
+            self._build_rule_prefilter()
         logger.info("Finished loading YARA rules.")
 
     def _save_compiled_rules(self, rules: yara.Rules, checksum: str) -> None:
 
         if not rules:
             return
+        # Write-then-rename so a crash never leaves a torn .yarac; the checksum goes last so it
+        # can only ever vouch for a fully written ruleset.
+        tmp_rules_path = self.compiled_rules_path.with_name(self.compiled_rules_path.name + ".tmp")
+        tmp_checksum_path = self.checksum_path.with_name(self.checksum_path.name + ".tmp")
         try:
-            rules.save(str(self.compiled_rules_path))
-            self.checksum_path.write_text(checksum)
-            logger.info(f"Compiled YARA rules saved to {self.compiled_rules_path}")
+            rules.save(str(tmp_rules_path))
+            os.replace(tmp_rules_path, self.compiled_rules_path)
+            tmp_checksum_path.write_text(checksum)
+            os.replace(tmp_checksum_path, self.checksum_path)
+            logger.info("Compiled YARA rules saved to %s", self.compiled_rules_path)
         except Exception as e:
             logger.error(f"Failed to save compiled YARA rules: {e}")
+            tmp_rules_path.unlink(missing_ok=True)
+            tmp_checksum_path.unlink(missing_ok=True)
+
+    def _build_rule_prefilter(self) -> None:
+
+        rules = self._rules
+        hints: Dict[str, Tuple[Optional[int], Optional[bytes]]] = {}
+        rule_count = 0
+        unhinted = False
+        # yara.Rules is its own iterator, so always walk it to the end to leave it reset.
+        for rule in rules or ():
+            rule_count += 1
+            max_filesize = rule.meta.get("max_filesize")
+            magic = rule.meta.get("magic")
+            if not isinstance(max_filesize, int) or isinstance(max_filesize, bool):
+                max_filesize = None
+            magic_bytes = None
+            if isinstance(magic, str):
+                try:
+                    magic_bytes = bytes.fromhex(magic) or None
+                except ValueError:
+                    logger.warning(f"Ignoring invalid magic hint '{magic}' in rule {rule.identifier}.")
+            if max_filesize is None and magic_bytes is None:
+                unhinted = True
+                continue
+            hints[rule.identifier] = (max_filesize, magic_bytes)
+        self._rule_count = rule_count
+        self._prefilter = RulePrefilter({} if unhinted else hints)
+        self._snapshot = (rules, self._prefilter)
+
+    def get_rule_snapshot(self) -> Tuple[Optional[yara.Rules], RulePrefilter]:
+        return self._snapshot
 
     def get_rules(self) -> Optional[yara.Rules]:
         return self._rules
 
-    def check_for_updates_and_reload(self) -> bool:
+    @property
+    def rule_count(self) -> int:
+        return self._rule_count
+
+    def start_watching(self) -> bool:
 
-        new_checksum = self._calculate_rules_checksum()
-        if new_checksum != self._rules_checksum:
-            logger.info("YARA rule changes detected. Reloading rules...")
-            self.load_rules(force_recompile=True)
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            logger.info("watchdog is not installed; YARA rule changes will only be picked up by polling.")
+            return False
+        if self._observer is not None:
             return True
-        return False
+
+        manager = self
+
+        class _RuleChangeHandler(FileSystemEventHandler):
+
+            def on_any_event(self, event):
+                if event.event_type not in RULES_WATCH_EVENT_TYPES:
+                    return
+                paths = (event.src_path, getattr(event, "dest_path", "") or "")
+                if event.is_directory or any(p.endswith(RULE_FILE_EXTENSIONS) for p in paths):
+                    manager._schedule_reload()
+
+        observer = Observer()
+        observer.daemon = True
+        observer.schedule(_RuleChangeHandler(), str(self.rules_dir), recursive=True)
+        observer.start()
+        self._observer = observer
+        logger.info(f"Watching {self.rules_dir} for YARA rule changes.")
+        return True
+
+    def stop_watching(self) -> None:
+
+        with self._reload_lock:
+            if self._reload_timer is not None:
+                self._reload_timer.cancel()
+                self._reload_timer = None
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+    def _schedule_reload(self) -> None:
+
+        with self._reload_lock:
+            if self._reload_timer is not None:
+                self._reload_timer.cancel()
+            self._reload_timer = threading.Timer(RULES_WATCH_DEBOUNCE, self._reload_from_watch)
+            self._reload_timer.daemon = True
+            self._reload_timer.start()
+
+    def _reload_from_watch(self) -> None:
+
+        with self._reload_lock:
+            self._reload_timer = None
+        try:
+            self.check_for_updates_and_reload()
+        except Exception as e:
+            logger.error(f"Failed to reload YARA rules after a file change: {e}")
+
+    def check_for_updates_and_reload(self) -> bool:
+
+        with self._load_lock:
+            fingerprint = self._fast_fingerprint()
+            if fingerprint == self._mtime_fingerprint:
+                return False
+            self._mtime_fingerprint = fingerprint
+            new_checksum, _ = self._calculate_rules_checksum(self._select_rule_files(fingerprint))
+            if new_checksum != self._rules_checksum:
+                logger.info("YARA rule changes detected. Reloading rules...")
+                self.load_rules(force_recompile=True)
+                return True
+            return False
@@ -1,5 +1,5 @@
-import time
 import signal
+import threading
 import logging
 import sys
 from pathlib import Path
@@ -16,12 +16,6 @@ except Exception as e:
 try:
     from falcon.config import ConfigManager
     from falcon.yara_manager import YaraManager
-    from falcon.scanner import Scanner
-    from falcon.updater import Updater
-    from falcon.report import ReportManager
-    from falcon.scheduler import SchedulerManager
-    from falcon import scheduled_tasks
-    from falcon.quarantine import QuarantineManager as QM_internal
 
 except ImportError as e:
     print(f"Error importing modules: {e}")
@@ -49,21 +43,42 @@ except Exception as e:
     logger = logging.getLogger(__name__)
     logger.error(f"Failed to configure file logging: {e}. Defaulting to stdout.")
 
-keep_running = True
+shutdown_event = threading.Event()
+RULES_POLL_INTERVAL = 300
 
 def handle_signal(signum, frame):
 
-    global keep_running
-    if keep_running:
+    if not shutdown_event.is_set():
         logger.info(f"Received signal {signum}. Initiating graceful shutdown...")
-        keep_running = False
+        shutdown_event.set()
+
+def poll_rules(yara_manager) -> None:
+
+    while not shutdown_event.wait(RULES_POLL_INTERVAL):
+        try:
+            if yara_manager.check_for_updates_and_reload():
+                logger.info("Rules poll reloaded changed YARA rules.")
+        except Exception as e:
+            logger.error(f"Error during rules poll: {e}", exc_info=True)
 
 if __name__ == "__main__":
     logger.info("Starting FalconDefender Scheduler Daemon...")
     
     scheduler_manager = None
 
+    # Installed before the heavier imports below so an early SIGTERM still shuts down cleanly.
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
     try:
+        # Deferred until here: APScheduler, SQLAlchemy and reportlab dominate startup imports.
+        from falcon.scanner import Scanner
+        from falcon.updater import Updater
+        from falcon.report import ReportManager
+        from falcon.scheduler import SchedulerManager
+        from falcon import scheduled_tasks
+        from falcon.quarantine import QuarantineManager as QM_internal
+
         logger.info("Initializing core components...")
         config_manager = ConfigManager()
         yara_manager = YaraManager(config_manager)
@@ -82,32 +97,22 @@ if __name__ == "__main__":
         scheduled_tasks.register_instance("report_manager", report_manager)
         logger.info("Instances registered successfully.")
 
-        try:
-            logger.info("Adding periodic scheduler wakeup job (every 60 seconds)...")
-            scheduler_manager.add_job(
-                func=scheduler_manager.scheduler.wakeup,
-                trigger='interval',
-                seconds=60,
-                name='_internal_scheduler_wakeup',
-            )
-            logger.info("Scheduler wakeup job added.")
-        except Exception as e:
-            logger.error(f"Failed to add scheduler wakeup job: {e}", exc_info=True)
+        # File notifications pick rule edits up immediately; the slow poll covers filesystems that drop events.
+        yara_manager.start_watching()
+        threading.Thread(target=poll_rules, args=(yara_manager,), name="rules-poll", daemon=True).start()
 
     except Exception as e:
         logger.error(f"Critical error during daemon initialization: {e}", exc_info=True)
         sys.exit(1)
 
-    signal.signal(signal.SIGTERM, handle_signal)
-    signal.signal(signal.SIGINT, handle_signal)
-
     logger.info("Daemon running. Scheduler is active in the background. Waiting for signals.")
     try:
-        while keep_running:
-            time.sleep(1)
+        # Blocks without periodic wakeups; the signal handler sets the event.
+        shutdown_event.wait()
     except Exception as e:
         logger.error(f"Daemon main loop encountered an unexpected error: {e}", exc_info=True)
     finally:
+        yara_manager.stop_watching()
         logger.info("Shutting down scheduler manager...")
         if scheduler_manager and scheduler_manager.scheduler.running:
             try:
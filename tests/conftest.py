@@ -0,0 +1,14 @@
+import asyncio
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+def pytest_asyncio_loop_factories(config, item):
+    # Textual's run_test() is many tiny tasks per keypress, which uvloop runs noticeably faster.
+    # Only the TUI module opts in; every other async test keeps the default loop.
+    if uvloop is not None and item.path.name == "test_tui.py":
+        return {"uvloop": uvloop.new_event_loop}
+    return {"asyncio": asyncio.new_event_loop}
@@ -3,6 +3,7 @@ import unittest
 import os
 import shutil
 import sys
+import tempfile
 import json
 from pathlib import Path
 from unittest.mock import patch, MagicMock, call
@@ -22,8 +23,7 @@ import yara
 class TestFalconCLI(unittest.TestCase):
 
     def setUp(self):
-        self.test_env_dir = Path("test_cli_env")
-        self.test_env_dir.mkdir(exist_ok=True)
+        self.test_env_dir = Path(tempfile.mkdtemp(prefix="falcon_test_"))
 
         # Mock the config paths to point to our test environment
         self.mock_config_path = self.test_env_dir / "config.json"
@@ -94,6 +94,9 @@ class TestFalconCLI(unittest.TestCase):
 
         self.cli = FalconCLI()
 
+    def tearDown(self):
+        shutil.rmtree(self.test_env_dir, ignore_errors=True)
+
     def _get_nested_config(self, key, config_dict):
         keys = key.split(".")
         current_level = config_dict
@@ -1,8 +1,8 @@
 
 import unittest
-import os
 import shutil
 import sqlite3
+import tempfile
 from pathlib import Path
 from datetime import datetime
 from unittest.mock import MagicMock
@@ -13,8 +13,7 @@ from falcon.config import ConfigManager
 class TestQuarantineManager(unittest.TestCase):
 
     def setUp(self):
-        self.test_quarantine_dir = Path("test_quarantine_env")
-        self.test_quarantine_dir.mkdir(exist_ok=True)
+        self.test_quarantine_dir = Path(tempfile.mkdtemp(prefix="falcon_test_"))
         self.test_db_path = self.test_quarantine_dir / "quarantine.db"
 
         # Mock ConfigManager
@@ -24,6 +23,8 @@ class TestQuarantineManager(unittest.TestCase):
         }.get(key)
 
         self.quarantine_manager = QuarantineManager(self.mock_config_manager)
+        # One connection per test for the assertions below; the manager keeps its own.
+        self.conn = sqlite3.connect(self.test_db_path)
 
         # Create dummy files to quarantine
         self.mal_doc_path = self.test_quarantine_dir / "malicious_doc.docx"
@@ -35,8 +36,8 @@ class TestQuarantineManager(unittest.TestCase):
         self.mal_dll_path.write_text("Malicious DLL content.")
 
     def tearDown(self):
-        if self.test_quarantine_dir.exists():
-            shutil.rmtree(self.test_quarantine_dir)
+        self.conn.close()
+        shutil.rmtree(self.test_quarantine_dir, ignore_errors=True)
 
     def test_quarantine_file(self):
         match_info = {"file_path": str(self.mal_doc_path), "rule_name": "DocMalware", "file_hash": "hash123"}
@@ -45,11 +46,7 @@ class TestQuarantineManager(unittest.TestCase):
         self.assertTrue(quarantined_path.exists())
         self.assertFalse(self.mal_doc_path.exists())
 
-        conn = sqlite3.connect(self.test_db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM quarantine_files WHERE original_path = ?", (str(self.mal_doc_path),))
-        record = cursor.fetchone()
-        conn.close()
+        record = self.conn.execute("SELECT * FROM quarantine_files WHERE original_path = ?", (str(self.mal_doc_path),)).fetchone()
 
         self.assertIsNotNone(record)
         self.assertEqual(record[1], str(self.mal_doc_path))
@@ -71,33 +68,21 @@ class TestQuarantineManager(unittest.TestCase):
         match_info = {"file_path": str(self.mal_doc_path), "rule_name": "DocMalware", "file_hash": "hash123"}
         quarantined_path = self.quarantine_manager.quarantine_file(self.mal_doc_path, match_info)
 
-        conn = sqlite3.connect(self.test_db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT id FROM quarantine_files WHERE original_path = ?", (str(self.mal_doc_path),))
-        record_id = cursor.fetchone()[0]
-        conn.close()
+        record_id = self.conn.execute("SELECT id FROM quarantine_files WHERE original_path = ?", (str(self.mal_doc_path),)).fetchone()[0]
 
         restored = self.quarantine_manager.restore_file(record_id)
         self.assertTrue(restored)
         self.assertTrue(self.mal_doc_path.exists())
         self.assertFalse(quarantined_path.exists())
 
-        conn = sqlite3.connect(self.test_db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT restored_at FROM quarantine_files WHERE id = ?", (record_id,))
-        restored_at = cursor.fetchone()[0]
-        conn.close()
+        restored_at = self.conn.execute("SELECT restored_at FROM quarantine_files WHERE id = ?", (record_id,)).fetchone()[0]
         self.assertIsNotNone(restored_at)
 
     def test_restore_file_original_path_exists(self):
         match_info = {"file_path": str(self.mal_doc_path), "rule_name": "DocMalware", "file_hash": "hash123"}
         self.quarantine_manager.quarantine_file(self.mal_doc_path, match_info)
 
-        conn = sqlite3.connect(self.test_db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT id FROM quarantine_files WHERE original_path = ?", (str(self.mal_doc_path),))
-        record_id = cursor.fetchone()[0]
-        conn.close()
+        record_id = self.conn.execute("SELECT id FROM quarantine_files WHERE original_path = ?", (str(self.mal_doc_path),)).fetchone()[0]
 
         # Create a dummy file at the original path to simulate conflict
         self.mal_doc_path.write_text("Conflicting content")
@@ -110,45 +95,28 @@ class TestQuarantineManager(unittest.TestCase):
         match_info = {"file_path": str(self.virus_exe_path), "rule_name": "Win32.Virus", "file_hash": "hash456"}
         quarantined_path = self.quarantine_manager.quarantine_file(self.virus_exe_path, match_info)
 
-        conn = sqlite3.connect(self.test_db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT id FROM quarantine_files WHERE original_path = ?", (str(self.virus_exe_path),))
-        record_id = cursor.fetchone()[0]
-        conn.close()
+        record_id = self.conn.execute("SELECT id FROM quarantine_files WHERE original_path = ?", (str(self.virus_exe_path),)).fetchone()[0]
 
         deleted = self.quarantine_manager.delete_quarantined_file(record_id)
         self.assertTrue(deleted)
         self.assertFalse(quarantined_path.exists())
 
-        conn = sqlite3.connect(self.test_db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT deleted_at FROM quarantine_files WHERE id = ?", (record_id,))
-        deleted_at = cursor.fetchone()[0]
-        conn.close()
+        deleted_at = self.conn.execute("SELECT deleted_at FROM quarantine_files WHERE id = ?", (record_id,)).fetchone()[0]
         self.assertIsNotNone(deleted_at)
 
     def test_delete_non_existent_quarantined_file_on_disk(self):
         match_info = {"file_path": str(self.mal_dll_path), "rule_name": "DLL_Injector", "file_hash": "hash789"}
         quarantined_path = self.quarantine_manager.quarantine_file(self.mal_dll_path, match_info)
 
-        conn = sqlite3.connect(self.test_db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT id FROM quarantine_files WHERE original_path = ?", (str(self.mal_dll_path),))
-        record_id = cursor.fetchone()[0]
-        conn.close()
+        record_id = self.conn.execute("SELECT id FROM quarantine_files WHERE original_path = ?", (str(self.mal_dll_path),)).fetchone()[0]
 
         # Manually delete the file from disk to simulate it being missing
-        if quarantined_path.exists():
-            os.remove(quarantined_path)
+        quarantined_path.unlink(missing_ok=True)
 
         deleted = self.quarantine_manager.delete_quarantined_file(record_id)
         self.assertTrue(deleted) # Should still mark as deleted in DB
 
-        conn = sqlite3.connect(self.test_db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT deleted_at FROM quarantine_files WHERE id = ?", (record_id,))
-        deleted_at = cursor.fetchone()[0]
-        conn.close()
+        deleted_at = self.conn.execute("SELECT deleted_at FROM quarantine_files WHERE id = ?", (record_id,)).fetchone()[0]
         self.assertIsNotNone(deleted_at)
 
 if __name__ == '__main__':
@@ -1,8 +1,8 @@
 
 import unittest
-import os
 from pathlib import Path
 import shutil
+import tempfile
 import time
 import json
 from unittest.mock import MagicMock
@@ -13,37 +13,44 @@ from falcon.config import ConfigManager
 
 class TestScanner(unittest.TestCase):
 
-    def setUp(self):
-        self.test_dir = Path("test_scanner_env")
-        self.test_dir.mkdir(exist_ok=True)
+    @classmethod
+    def setUpClass(cls):
+        # Rules are compiled once for the whole class; only the scanned files are per-test.
+        cls.shared_dir = Path(tempfile.mkdtemp(prefix="falcon_test_"))
 
-        self.rules_dir = self.test_dir / "rules"
-        self.rules_dir.mkdir(exist_ok=True)
-        self.compiled_rules_file = self.test_dir / "compiled_rules.yarac"
+        cls.rules_dir = cls.shared_dir / "rules"
+        cls.rules_dir.mkdir(exist_ok=True)
         eicar_rule_content = r'''rule eicar_test { strings: $a = "X5O!P%@AP[4\\PZX54(P^)7CC)7}$EICAR-STANDARD-ANTIVIRUS-TEST-FILE!$H+H*" condition: $a }
 '''
-        (self.rules_dir / "eicar.yar").write_text(eicar_rule_content)
+        (cls.rules_dir / "eicar.yar").write_text(eicar_rule_content)
         malicious_rule_content = r'''rule malicious_string { strings: $s = "malicious_content_here" condition: $s }'''
-        (self.rules_dir / "malicious_string.yar").write_text(malicious_rule_content)
+        (cls.rules_dir / "malicious_string.yar").write_text(malicious_rule_content)
 
         # Add a dummy rule to make sure at least one rule is always present
-        (self.rules_dir / "dummy.yar").write_text("rule dummy { strings: $a = \"dummy_string\" condition: $a }")
+        (cls.rules_dir / "dummy.yar").write_text("rule dummy { strings: $a = \"dummy_string\" condition: $a }")
 
         # Mock ConfigManager for YaraManager and Scanner
-        self.mock_config_manager = MagicMock(spec=ConfigManager)
-        self.mock_config_manager.get.side_effect = lambda key, default=None: {
-            "rules_dir": str(self.rules_dir),
-            "report_dir": str(self.test_dir / "reports"), # Provide a valid report_dir
+        cls.mock_config_manager = MagicMock(spec=ConfigManager)
+        cls.mock_config_manager.get.side_effect = lambda key, default=None: {
+            "rules_dir": str(cls.rules_dir),
+            "report_dir": str(cls.shared_dir / "reports"), # Provide a valid report_dir
             "scanner_threads": 2,
             "max_file_size_mb": 1,
             "blocked_extensions": [".tmp"],
             "yara_timeout": 5,
-            "rules_dir": str(self.rules_dir)
         }.get(key, default)
 
-        self.yara_manager = YaraManager(self.mock_config_manager)
-        self.yara_manager.load_rules(force_recompile=True)
+        # The constructor already loads (and, for a fresh rules dir, compiles) the rules.
+        cls.yara_manager = YaraManager(cls.mock_config_manager)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.shared_dir, ignore_errors=True)
 
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp(prefix="falcon_test_"))
+
+        # A fresh Scanner per test keeps incremental-scan state from leaking between tests.
         self.scanner = Scanner(self.mock_config_manager, self.yara_manager, MagicMock())
 
         self.clean_file = self.test_dir / "clean.txt"
@@ -59,10 +66,8 @@ class TestScanner(unittest.TestCase):
         self.large_file.write_text("A" * (2 * 1024 * 1024))
 
     def tearDown(self):
-        if self.test_dir.exists():
-            shutil.rmtree(self.test_dir)
-        if self.compiled_rules_file.exists():
-            os.remove(self.compiled_rules_file)
+        self.scanner.executor.shutdown(wait=True)
+        shutil.rmtree(self.test_dir, ignore_errors=True)
 
     def test_scan_file_clean(self):
         result = self.scanner.scan_path(self.clean_file)
@@ -113,6 +118,46 @@ class TestScanner(unittest.TestCase):
         self.assertEqual(Path(results3["matches"][0]["file_path"]), self.clean_file)
         self.assertEqual(results3["matches"][0]["rule_name"], "malicious_string")
 
+    def _manager_for_rules(self, rule_text):
+        rules_dir = self.test_dir / "rules"
+        rules_dir.mkdir(exist_ok=True)
+        (rules_dir / "a.yar").write_text(rule_text)
+        config = MagicMock(spec=ConfigManager)
+        config.get.side_effect = lambda key, default=None: {
+            "rules_dir": str(rules_dir),
+        }.get(key, self.mock_config_manager.get(key, default))
+        return YaraManager(config), rules_dir
+
+    def test_scan_skips_files_no_hinted_rule_applies(self):
+        manager, _ = self._manager_for_rules("rule pe_evil { meta: magic = \"4D5A\" strings: $a = \"evil\" condition: $a }")
+        scanner = Scanner(self.mock_config_manager, manager, MagicMock())
+        self.addCleanup(scanner.executor.shutdown, wait=True)
+        pe_file = self.test_dir / "evil.exe"
+        pe_file.write_bytes(b"MZ evil")
+        text_file = self.test_dir / "evil.txt"
+        text_file.write_bytes(b"plain evil")
+
+        self.assertEqual([m["rule_name"] for m in scanner.scan_path(pe_file)["matches"]], ["pe_evil"])
+        # The rule would match the bytes, but its magic hint rules the file out before YARA runs.
+        self.assertEqual(scanner.scan_path(text_file)["matches"], [])
+
+    def test_scan_uses_reloaded_rules(self):
+        manager, rules_dir = self._manager_for_rules("rule evil { strings: $a = \"evil\" condition: $a }")
+        scanner = Scanner(self.mock_config_manager, manager, MagicMock())
+        self.addCleanup(scanner.executor.shutdown, wait=True)
+        evil_file = self.test_dir / "evil.txt"
+        evil_file.write_bytes(b"plain evil")
+        pe_file = self.test_dir / "other.exe"
+        pe_file.write_bytes(b"MZ other_payload")
+        self.assertEqual(len(scanner.scan_path(evil_file)["matches"]), 1)
+
+        (rules_dir / "a.yar").write_text("rule pe_other { meta: magic = \"4D5A\" strings: $a = \"other_payload\" condition: $a }")
+        self.assertTrue(manager.check_for_updates_and_reload())
+
+        # The existing Scanner follows the reload, and the prefilter it applies belongs to the new rules.
+        self.assertEqual(scanner.scan_path(evil_file)["matches"], [])
+        self.assertEqual([m["rule_name"] for m in scanner.scan_path(pe_file)["matches"]], ["pe_other"])
+
     def test_scan_result_to_json(self):
         mock_matches = [
             {
@@ -3,37 +3,68 @@ Tests for the FalconDefender TUI application.
 '''
 
 import pytest
+import pytest_asyncio
 import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, patch
 
 from textual.app import App
-from textual.widgets import DataTable, Input, Tabs
+from textual.widgets import Input, Tabs
 
 # Assuming falcon.app is structured to allow these imports
-from falcon.app import MainApp, ScanPathInputModal, ConfirmActionModal
+from falcon.app import MainApp, ScanPathInputModal, UpdateRulesModal, ConfirmActionModal
 from falcon.tui_integration import ScanState
-from falcon.config import ConfigManager
-from falcon.yara_manager import YaraManager
-from falcon.scanner import Scanner
-from falcon.quarantine import QuarantineManager
-from falcon.updater import Updater
 from falcon.tui_integration import ScannerAdapter, QuarantineAdapter, UpdaterAdapter
 
 
+class _StubConfig:
+    """Plain stand-in for ConfigManager; specced MagicMocks introspect the class on every build."""
+    def get(self, key, default=None):
+        return "/tmp/rules"
+
+
+class _StubYaraManager:
+    def check_for_updates_and_reload(self):
+        return False
+
+
+class _StubScanner:
+    pass
+
+
+class _StubQuarantineManager:
+    def list_quarantined_files(self):
+        return []
+
+
+class _StubUpdater:
+    pass
+
+
+class _StubSchedulerAdapter:
+    async def list_jobs(self):
+        return []
+
+    async def remove_job(self, job_id):
+        return True
+
+    async def add_job(self, task_data):
+        return True
+
+
 class MockFalconDefenderApp:
     """A mock for the FalconDefenderApp logic class."""
     def __init__(self):
-        self.config_manager = MagicMock(spec=ConfigManager)
-        self.config_manager.get.return_value = "/tmp/rules"
-        self.yara_manager = MagicMock(spec=YaraManager)
-        self.scanner = MagicMock(spec=Scanner)
-        self.quarantine_manager = MagicMock(spec=QuarantineManager)
-        self.updater = MagicMock(spec=Updater)
-        
+        self.config_manager = _StubConfig()
+        self.yara_manager = _StubYaraManager()
+        self.scanner = _StubScanner()
+        self.quarantine_manager = _StubQuarantineManager()
+        self.updater = _StubUpdater()
+
         self.event_queue = asyncio.Queue()
         self.scanner_adapter = ScannerAdapter(self.scanner, self.event_queue)
         self.quarantine_adapter = QuarantineAdapter(self.quarantine_manager, self.event_queue)
         self.updater_adapter = UpdaterAdapter(self.updater, self.yara_manager, self.event_queue)
+        self.scheduler_adapter = _StubSchedulerAdapter()
         self.last_scan_path = None
 
 
@@ -43,79 +74,152 @@ def mock_tui_logic():
     return MockFalconDefenderApp()
 
 
-@pytest.mark.asyncio
-async def test_tui_start_scan_modal(mock_tui_logic):
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def running_app():
+    """One running MainApp shared by the tests below, so Textual boots once per module."""
+    logic = MockFalconDefenderApp()
+    app = MainApp(logic)
+    async with app.run_test() as driver:
+        yield app, driver, logic
+
+
+def _reset_shared_app(app, logic):
+    """Return the shared app to a clean main screen between tests."""
+    while len(app.screen_stack) > 1:
+        app.pop_screen()
+    while not logic.event_queue.empty():
+        logic.event_queue.get_nowait()
+    app.matches_widget.clear_matches()
+    app.stats_widget.matches = 0
+    app.logo_widget.state = ScanState.IDLE.value
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_tui_start_scan_modal(running_app, tmp_path):
     """Test that the scan modal opens and triggers a scan."""
-    app = MainApp(mock_tui_logic)
-    mock_tui_logic.scanner_adapter.start_scan = AsyncMock()
+    app, driver, logic = running_app
+    _reset_shared_app(app, logic)
+    logic.scanner_adapter.start_scan = AsyncMock()
 
-    async with app.run_test() as driver:
-        await driver.press("s")
-        assert isinstance(app.screen, ScanPathInputModal)
+    await driver.press("s")
+    assert isinstance(app.screen, ScanPathInputModal)
 
-        modal = app.screen
-        path_input = modal.query_one("#scan-path-input", Input)
-        path_input.value = "/test/path"
-        await driver.click("#btn-scan-confirm")
+    modal = app.screen
+    path_input = modal.query_one("#scan-path-input", Input)
+    path_input.value = str(tmp_path)
+    await driver.click("#btn-scan-confirm")
+    # The scan itself is started with create_task, so let it run.
+    await driver.pause()
 
-        assert not isinstance(app.screen, ScanPathInputModal)
-        mock_tui_logic.scanner_adapter.start_scan.assert_awaited_once_with("/test/path")
+    assert not isinstance(app.screen, ScanPathInputModal)
+    logic.scanner_adapter.start_scan.assert_awaited_once_with(str(tmp_path), quarantine_matches=False)
 
 
-@pytest.mark.asyncio
-async def test_tui_scan_actions(mock_tui_logic):
+@pytest.mark.asyncio(loop_scope="module")
+async def test_tui_scan_actions(running_app):
     """Test pause, resume, and cancel scan actions."""
-    app = MainApp(mock_tui_logic)
-    mock_tui_logic.scanner_adapter.pause = AsyncMock()
-    mock_tui_logic.scanner_adapter.resume = AsyncMock()
-    mock_tui_logic.scanner_adapter.cancel = AsyncMock()
+    app, driver, logic = running_app
+    _reset_shared_app(app, logic)
+    logic.scanner_adapter.pause = AsyncMock()
+    logic.scanner_adapter.resume = AsyncMock()
+    logic.scanner_adapter.cancel = AsyncMock()
 
-    async with app.run_test() as driver:
-        app.logo_widget.state = ScanState.SCANNING.value
+    app.logo_widget.state = ScanState.SCANNING.value
 
-        await driver.press("p")
-        mock_tui_logic.scanner_adapter.pause.assert_awaited_once()
-        assert app.logo_widget.state == ScanState.PAUSED.value
+    await driver.press("p")
+    logic.scanner_adapter.pause.assert_awaited_once()
+    assert app.logo_widget.state == ScanState.PAUSED.value
 
-        await driver.press("r")
-        mock_tui_logic.scanner_adapter.resume.assert_awaited_once()
-        assert app.logo_widget.state == ScanState.SCANNING.value
+    await driver.press("r")
+    logic.scanner_adapter.resume.assert_awaited_once()
+    assert app.logo_widget.state == ScanState.SCANNING.value
 
-        await driver.press("c")
-        mock_tui_logic.scanner_adapter.cancel.assert_awaited_once()
-        assert app.logo_widget.state == ScanState.IDLE.value
+    await driver.press("c")
+    logic.scanner_adapter.cancel.assert_awaited_once()
+    assert app.logo_widget.state == ScanState.IDLE.value
 
 
-@pytest.mark.asyncio
-async def test_tui_update_rules(mock_tui_logic):
+@pytest.mark.asyncio(loop_scope="module")
+async def test_tui_update_rules(running_app, tmp_path):
     """Test the rule update functionality."""
-    app = MainApp(mock_tui_logic)
-    mock_tui_logic.updater_adapter.update_rules = AsyncMock(return_value=True)
+    app, driver, logic = running_app
+    _reset_shared_app(app, logic)
+    update_called = asyncio.Event()
 
-    async with app.run_test() as driver:
-        await driver.press("u")
-        await asyncio.sleep(0.1)
-        mock_tui_logic.updater_adapter.update_rules.assert_awaited_once()
+    async def update_rules(*args, **kwargs):
+        update_called.set()
+        return True
 
+    logic.updater_adapter.update_rules = AsyncMock(side_effect=update_rules)
 
-@pytest.mark.asyncio
-async def test_tui_match_event_display(mock_tui_logic):
+    await driver.press("u")
+    assert isinstance(app.screen, UpdateRulesModal)
+
+    modal = app.screen
+    modal.query_one("#update-rules-path-input", Input).value = str(tmp_path)
+    await driver.click("#btn-update-confirm")
+    await asyncio.wait_for(update_called.wait(), timeout=2.0)
+
+    assert not isinstance(app.screen, UpdateRulesModal)
+    logic.updater_adapter.update_rules.assert_awaited_once_with(f"file://{tmp_path.absolute()}")
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_tui_match_event_display(running_app):
     """Test that a match event updates the UI correctly."""
-    app = MainApp(mock_tui_logic)
-    
-    async with app.run_test() as driver:
+    app, driver, logic = running_app
+    _reset_shared_app(app, logic)
+    match_processed = asyncio.Event()
+    original_add_match = app._add_match
+
+    def add_match_and_signal(data):
+        original_add_match(data)
+        match_processed.set()
+
+    app._add_match = add_match_and_signal
+    try:
         match_event = {
             "type": "match",
             "data": {
                 "id": "123", "file": "file.txt", "rule": "rule1", "severity": "high", "timestamp": "now"
             }
         }
-        await mock_tui_logic.event_queue.put(match_event)
-        await asyncio.sleep(0.2)  # Allow event processing
+        await logic.event_queue.put(match_event)
+        await asyncio.wait_for(match_processed.wait(), timeout=2.0)
 
-        table = app.query_one("#matches-table", DataTable)
+        table = app.matches_widget.table
         assert table.row_count == 1
         assert app.stats_widget.matches == 1
+    finally:
+        app._add_match = original_add_match
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_tui_match_event_display_bulk(running_app):
+    """Test that a burst of match events is drained and rendered as one batch."""
+    app, driver, logic = running_app
+    _reset_shared_app(app, logic)
+    batch_applied = asyncio.Event()
+    original_apply_batch = app._apply_batch
+
+    def apply_batch_and_signal(events):
+        original_apply_batch(events)
+        batch_applied.set()
+
+    app._apply_batch = apply_batch_and_signal
+    try:
+        for i in range(1000):
+            logic.event_queue.put_nowait({
+                "type": "match",
+                "data": {"id": str(i), "file": f"file{i}.txt", "rule": "rule1", "severity": "high", "timestamp": "now"}
+            })
+        await asyncio.wait_for(batch_applied.wait(), timeout=2.0)
+
+        table = app.matches_widget.table
+        assert table.row_count == 1000
+        assert app.stats_widget.matches == 1000
+    finally:
+        app._apply_batch = original_apply_batch
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,242 @@
+'''
+Tests for the adapters between the TUI and the FalconDefender backend.
+'''
+
+import zlib
+import pytest
+import asyncio
+from datetime import datetime
+
+from falcon.tui_integration import (
+    EventBatcher, QuarantineAdapter, ScannerAdapter, SchedulerAdapter, ScanStats, TUIEventHandler,
+    MATCH_BATCH_SIZE, put_many,
+)
+
+
+class _StubQuarantineManager:
+    def restore_file(self, record_id):
+        return record_id == 1
+
+
+class _StubScanner:
+    def __init__(self, match_count):
+        self.match_count = match_count
+
+    def set_event_queue(self, queue):
+        pass
+
+    def scan_path(self, path, incremental, quarantine_matches):
+        matches = [
+            {"file_path": f"{path}/file{i}.bin", "rule_name": "rule1", "confidence": "High"}
+            for i in range(self.match_count)
+        ]
+        return {"scanned_path": str(path), "total_files_scanned": 300, "matches": matches}
+
+
+class _StubTrigger:
+    def __str__(self):
+        return "interval[1:00:00]"
+
+
+class _StubJob:
+    def __init__(self, job_id, next_run_time):
+        self.id = job_id
+        self.name = f"job {job_id}"
+        self.trigger = _StubTrigger()
+        self._next_run_time = next_run_time
+        self.func = _StubScanner.scan_path
+
+    @property
+    def next_run_time(self):
+        if isinstance(self._next_run_time, Exception):
+            raise self._next_run_time
+        return self._next_run_time
+
+
+class _StubSchedulerManager:
+    def __init__(self, jobs):
+        self.jobs = jobs
+
+    def get_jobs(self):
+        return self.jobs
+
+
+def _drain(queue):
+    events = []
+    while not queue.empty():
+        events.append(queue.get_nowait())
+    return events
+
+
+@pytest.mark.asyncio
+async def test_event_batcher_coalesces_consecutive_events_in_order():
+    """Events added within one window are coalesced per run of one type, keeping their order."""
+    queue = asyncio.Queue()
+    batcher = EventBatcher(queue, interval=0.01)
+    batcher.add({"type": "info", "data": {"msg": "a"}})
+    batcher.add({"type": "info", "data": {"msg": "b"}})
+    batcher.add({"type": "error", "data": {"msg": "c"}})
+    batcher.add({"type": "info", "data": {"msg": "d"}})
+    assert queue.empty()
+
+    await batcher._flusher_task
+    assert _drain(queue) == [
+        {"type": "info_batch", "data": [{"msg": "a"}, {"msg": "b"}]},
+        {"type": "error", "data": {"msg": "c"}},
+        {"type": "info", "data": {"msg": "d"}},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_event_batcher_flusher_exits_when_idle():
+    """The flusher task finishes once nothing is pending and a new one starts on the next add."""
+    queue = asyncio.Queue()
+    batcher = EventBatcher(queue, interval=0.01)
+    batcher.add({"type": "info", "data": {"msg": "first"}})
+    first_task = batcher._flusher_task
+
+    await asyncio.wait_for(first_task, timeout=1.0)
+    assert first_task.done()
+    assert _drain(queue) == [{"type": "info", "data": {"msg": "first"}}]
+
+    batcher.add({"type": "info", "data": {"msg": "second"}})
+    assert batcher._flusher_task is not first_task
+    await asyncio.wait_for(batcher._flusher_task, timeout=1.0)
+    assert _drain(queue) == [{"type": "info", "data": {"msg": "second"}}]
+
+
+@pytest.mark.asyncio
+async def test_put_many_waits_on_full_queue():
+    """put_many fills a bounded queue, then waits for room instead of dropping events."""
+    queue = asyncio.Queue(maxsize=2)
+    events = [{"type": "info", "data": i} for i in range(5)]
+    task = asyncio.create_task(put_many(queue, events))
+
+    await asyncio.sleep(0)
+    assert not task.done()
+    assert queue.qsize() == 2
+
+    received = []
+    while len(received) < len(events):
+        received.append(await asyncio.wait_for(queue.get(), timeout=1.0))
+    await asyncio.wait_for(task, timeout=1.0)
+    assert received == events
+
+
+@pytest.mark.asyncio
+async def test_quarantine_adapter_keeps_info_and_error_in_order():
+    """Success and failure messages share the batcher, so an error never overtakes earlier info."""
+    queue = asyncio.Queue()
+    adapter = QuarantineAdapter(_StubQuarantineManager(), queue)
+    assert await adapter.restore_file(1) is True
+    assert await adapter.restore_file(2) is False
+
+    await adapter._batcher._flusher_task
+    assert [event["type"] for event in _drain(queue)] == ["info", "error"]
+
+
+@pytest.mark.asyncio
+async def test_event_handler_runs_sync_then_async_and_survives_failures(caplog):
+    """Sync handlers run first in registration order, async ones concurrently; a failure blocks no one."""
+    handler = TUIEventHandler()
+    calls = []
+    both_async_started = asyncio.Event()
+    started = []
+
+    async def async_handler(name):
+        calls.append(f"{name}:start")
+        started.append(name)
+        if len(started) == 2:
+            both_async_started.set()
+        await asyncio.wait_for(both_async_started.wait(), timeout=1.0)
+        calls.append(f"{name}:end")
+
+    async def async_first(data):
+        await async_handler("async_first")
+
+    async def async_second(data):
+        await async_handler("async_second")
+
+    async def async_failing(data):
+        raise RuntimeError("async boom")
+
+    def sync_failing(data):
+        raise RuntimeError("sync boom")
+
+    handler.register_handler("scan", async_first)
+    handler.register_handler("scan", lambda data: calls.append("sync_first"))
+    handler.register_handler("scan", sync_failing)
+    handler.register_handler("scan", async_failing)
+    handler.register_handler("scan", async_second)
+    handler.register_handler("scan", lambda data: calls.append("sync_second"))
+
+    await handler.emit("scan", {})
+
+    assert calls[:2] == ["sync_first", "sync_second"]
+    # Both async handlers were in flight at once, which a sequential await would deadlock on.
+    assert calls[2:4] == ["async_first:start", "async_second:start"]
+    assert sorted(calls[4:]) == ["async_first:end", "async_second:end"]
+    assert "sync boom" in caplog.text
+    assert "async boom" in caplog.text
+
+
+async def _run_stub_scan(adapter, path):
+    await adapter.start_scan(path)
+    await adapter.scan_task
+    return _drain(adapter.event_queue)
+
+
+@pytest.mark.asyncio
+async def test_scanner_adapter_emits_batched_matches_progress_and_done():
+    """A finished scan emits match batches of at most MATCH_BATCH_SIZE, live progress and a done snapshot."""
+    adapter = ScannerAdapter(_StubScanner(match_count=250), asyncio.Queue())
+    events = await _run_stub_scan(adapter, "/data")
+
+    assert [event["type"] for event in events] == ["info", "match_batch", "match_batch", "match_batch", "progress", "done"]
+    batches = [event["data"] for event in events if event["type"] == "match_batch"]
+    assert [len(batch) for batch in batches] == [MATCH_BATCH_SIZE, MATCH_BATCH_SIZE, 50]
+    first = batches[0][0]
+    assert first["file"] == "/data/file0.bin"
+    assert first["rule"] == "rule1"
+    assert first["severity"] == "high"
+
+    progress = events[4]["data"]
+    assert isinstance(progress, ScanStats)
+    assert progress is adapter.stats
+    assert progress.get("scanned") == 300
+    assert progress.get("matches") == 250
+
+    done = events[5]["data"]
+    assert done["stats"] == adapter.stats.as_dict()
+    # The done payload is a snapshot, so resetting the live stats does not change it.
+    adapter.stats.reset()
+    assert done["stats"]["matches"] == 250
+    assert isinstance(done["stats"], dict)
+
+
+@pytest.mark.asyncio
+async def test_scanner_adapter_match_ids_are_stable_crc32():
+    """Match ids are the CRC32 of the file path, so they are the same on every scan."""
+    adapter = ScannerAdapter(_StubScanner(match_count=3), asyncio.Queue())
+    first = [m["id"] for e in await _run_stub_scan(adapter, "/data") if e["type"] == "match_batch" for m in e["data"]]
+    second = [m["id"] for e in await _run_stub_scan(adapter, "/data") if e["type"] == "match_batch" for m in e["data"]]
+
+    assert first == second
+    assert first == [zlib.crc32(f"/data/file{i}.bin".encode("utf-8")) for i in range(3)]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_adapter_list_jobs():
+    """list_jobs flattens scheduler jobs in a worker thread and survives a failing next_run_time."""
+    jobs = [
+        _StubJob("a", datetime(2030, 1, 2, 3, 4, 5)),
+        _StubJob("b", None),
+        _StubJob("c", RuntimeError("jobstore locked")),
+    ]
+    adapter = SchedulerAdapter(_StubSchedulerManager(jobs), None, None, asyncio.Queue())
+
+    assert await adapter.list_jobs() == [
+        {"id": "a", "name": "job a", "trigger": "interval[1:00:00]", "next_run_time": "2030-01-02T03:04:05", "func_name": "scan_path"},
+        {"id": "b", "name": "job b", "trigger": "interval[1:00:00]", "next_run_time": "N/A", "func_name": "scan_path"},
+        {"id": "c", "name": "job c", "trigger": "interval[1:00:00]", "next_run_time": "Error calculating", "func_name": "scan_path"},
+    ]
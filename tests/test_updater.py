@@ -0,0 +1,146 @@
+import unittest
+import os
+import json
+import shutil
+import asyncio
+import zipfile
+import tempfile
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from falcon.updater import Updater, _fast_copy, MAX_UPDATE_WORKERS
+
+def _rule(name, needle):
+    return f"rule {name} {{ strings: $a = \"{needle}\" condition: $a }}"
+
+class TestUpdater(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp(prefix="falcon_test_"))
+        self.rules_dir = self.test_dir / "rules"
+        self.source_dir = self.test_dir / "source"
+        self.source_dir.mkdir()
+        self.updater = Updater(self.rules_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _update_from_source_dir(self):
+        return self.updater.update_rules(f"file://{self.source_dir.absolute()}")
+
+    def test_update_from_directory(self):
+        (self.source_dir / "a.yar").write_text(_rule("rule_a", "needle_a"))
+        (self.source_dir / "b.yara").write_text(_rule("rule_b", "needle_b"))
+        (self.source_dir / "notes.txt").write_text("not a rule")
+
+        self.assertTrue(self._update_from_source_dir())
+        self.assertEqual((self.rules_dir / "a.yar").read_text(), _rule("rule_a", "needle_a"))
+        self.assertTrue((self.rules_dir / "b.yara").exists())
+        self.assertFalse((self.rules_dir / "notes.txt").exists())
+
+    def test_update_from_zip(self):
+        zip_path = self.test_dir / "bundle.zip"
+        with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            # Several members per directory so both the serial and the parallel extract paths run.
+            for folder in ("malware", "exploits", "nested/deeper"):
+                for i in range(5):
+                    zf.writestr(f"{folder}/r{i}.yar", _rule(f"{folder.replace('/', '_')}_{i}", f"needle_{folder}_{i}"))
+                zf.writestr(f"{folder}/README.md", "docs")
+        checksum = self.updater._calculate_checksum(zip_path)
+
+        self.assertTrue(self.updater.update_rules(f"file://{zip_path.absolute()}", expected_checksum=checksum))
+        installed = sorted(str(p.relative_to(self.rules_dir)) for p in self.rules_dir.rglob("*.yar"))
+        self.assertEqual(len(installed), 15)
+        self.assertIn("nested/deeper/r4.yar", installed)
+        self.assertEqual(list(self.rules_dir.rglob("README.md")), [])
+        self.assertFalse((self.test_dir / ".temp_rules_update").exists())
+
+    def test_update_from_zip_rejects_bad_checksum(self):
+        zip_path = self.test_dir / "bundle.zip"
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            zf.writestr("a.yar", _rule("rule_a", "needle_a"))
+
+        self.assertFalse(self.updater.update_rules(f"file://{zip_path.absolute()}", expected_checksum="0" * 64))
+        self.assertFalse((self.rules_dir / "a.yar").exists())
+
+    def test_invalid_rule_reported_every_run(self):
+        (self.source_dir / "good.yar").write_text(_rule("good", "needle_good"))
+        (self.source_dir / "bad.yar").write_text("rule bad { strings: $a = \"needle_bad\" condition: $a and }")
+
+        for _ in range(2):
+            with self.assertLogs("falcon.updater", level="ERROR") as logs:
+                self.assertTrue(self._update_from_source_dir())
+            self.assertTrue(any("Invalid YARA rule bad.yar" in line for line in logs.output))
+        self.assertFalse((self.rules_dir / "bad.yar").exists())
+        self.assertTrue((self.rules_dir / "good.yar").exists())
+        self.assertNotIn("bad.yar", json.loads(self.updater.compile_cache_path.read_text()))
+
+    def test_unchanged_rerun_skips_compile(self):
+        (self.source_dir / "a.yar").write_text(_rule("rule_a", "needle_a"))
+        self.assertTrue(self._update_from_source_dir())
+
+        # A fresh Updater has to pick the cache up from disk.
+        updater = Updater(self.rules_dir)
+        with patch("yara.compile") as mock_compile:
+            self.assertTrue(updater.update_rules(f"file://{self.source_dir.absolute()}"))
+            mock_compile.assert_not_called()
+
+            (self.source_dir / "a.yar").write_text(_rule("rule_a", "needle_a_changed"))
+            self.assertTrue(updater.update_rules(f"file://{self.source_dir.absolute()}"))
+            mock_compile.assert_called_once()
+        self.assertEqual((self.rules_dir / "a.yar").read_text(), _rule("rule_a", "needle_a_changed"))
+
+    def test_compile_cache_drops_labels_no_longer_offered(self):
+        (self.source_dir / "a.yar").write_text(_rule("rule_a", "needle_a"))
+        (self.source_dir / "b.yar").write_text(_rule("rule_b", "needle_b"))
+        self.assertTrue(self._update_from_source_dir())
+        self.assertEqual(set(json.loads(self.updater.compile_cache_path.read_text())), {"a.yar", "b.yar"})
+
+        (self.source_dir / "b.yar").unlink()
+        self.assertTrue(self._update_from_source_dir())
+        self.assertEqual(set(json.loads(self.updater.compile_cache_path.read_text())), {"a.yar"})
+
+    def test_update_workers_default_is_capped(self):
+        with patch("falcon.updater.os.cpu_count", return_value=64):
+            self.assertEqual(self.updater._get_update_workers(), MAX_UPDATE_WORKERS)
+        with patch("falcon.updater.os.cpu_count", return_value=4):
+            self.assertEqual(self.updater._get_update_workers(), 4)
+
+        config = MagicMock()
+        config.get.side_effect = lambda key: {"updater_threads": 3}.get(key)
+        self.assertEqual(Updater(self.rules_dir, config)._get_update_workers(), 3)
+
+    def test_fast_copy_preserves_mode_and_mtime(self):
+        source = self.source_dir / "a.yar"
+        source.write_text(_rule("rule_a", "needle_a"))
+        os.chmod(source, 0o640)
+        os.utime(source, ns=(1_000_000_000, 2_000_000_000))
+        dest = self.test_dir / "copy.yar"
+
+        _fast_copy(source, dest)
+        self.assertEqual(dest.read_bytes(), source.read_bytes())
+        self.assertEqual(dest.stat().st_mode & 0o777, 0o640)
+        self.assertEqual(dest.stat().st_mtime_ns, 2_000_000_000)
+
+    def test_update_rules_async_download(self):
+        bundle = self.test_dir / "bundle.zip"
+        with zipfile.ZipFile(bundle, "w") as zf:
+            zf.writestr("remote.yar", _rule("remote", "needle_remote"))
+
+        async def fake_download(session, url, destination_path, expected_checksum=None):
+            shutil.copyfile(bundle, destination_path)
+            return True
+
+        with patch.object(self.updater, "_download_file_async", side_effect=fake_download) as mock_download:
+            self.assertTrue(asyncio.run(self.updater.update_rules_async("https://example.com/rules.zip")))
+        self.assertEqual(mock_download.call_args.args[1], "https://example.com/rules.zip")
+        self.assertTrue((self.rules_dir / "remote.yar").exists())
+        self.assertFalse((self.test_dir / ".temp_rules_download").exists())
+
+    def test_update_rules_async_local_source(self):
+        (self.source_dir / "a.yar").write_text(_rule("rule_a", "needle_a"))
+        self.assertTrue(asyncio.run(self.updater.update_rules_async(f"file://{self.source_dir.absolute()}")))
+        self.assertTrue((self.rules_dir / "a.yar").exists())
+
+if __name__ == '__main__':
+    unittest.main()
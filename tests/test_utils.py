@@ -0,0 +1,48 @@
+import unittest
+from unittest.mock import patch, mock_open
+
+from falcon.utils import get_physical_core_cpus
+
+def _cpuinfo(*blocks):
+    return "\n".join("\n".join(f"{key}\t: {value}" for key, value in block) + "\n" for block in blocks)
+
+# Two cores with two SMT threads each; Linux numbers the second thread of every core after all first threads.
+X86_SMT_CPUINFO = _cpuinfo(
+    [("processor", 0), ("vendor_id", "GenuineIntel"), ("physical id", 0), ("core id", 0)],
+    [("processor", 1), ("vendor_id", "GenuineIntel"), ("physical id", 0), ("core id", 1)],
+    [("processor", 2), ("vendor_id", "GenuineIntel"), ("physical id", 0), ("core id", 0)],
+    [("processor", 3), ("vendor_id", "GenuineIntel"), ("physical id", 0), ("core id", 1)],
+)
+
+ARM_CPUINFO = _cpuinfo(
+    [("processor", 0), ("BogoMIPS", "108.00"), ("CPU implementer", "0x41")],
+    [("processor", 1), ("BogoMIPS", "108.00"), ("CPU implementer", "0x41")],
+    [("processor", 2), ("BogoMIPS", "108.00"), ("CPU implementer", "0x41")],
+    [("processor", 3), ("BogoMIPS", "108.00"), ("CPU implementer", "0x41")],
+) + "Hardware\t: BCM2835\n"
+
+class TestGetPhysicalCoreCpus(unittest.TestCase):
+
+    def _cores(self, cpuinfo, allowed):
+        with patch("falcon.utils.os.sched_getaffinity", return_value=set(allowed), create=True), \
+                patch("builtins.open", mock_open(read_data=cpuinfo)):
+            return get_physical_core_cpus()
+
+    def test_x86_smt_one_cpu_per_core(self):
+        self.assertEqual(self._cores(X86_SMT_CPUINFO, range(4)), [0, 1])
+
+    def test_arm_without_core_id_uses_every_cpu(self):
+        self.assertEqual(self._cores(ARM_CPUINFO, range(4)), [0, 1, 2, 3])
+
+    def test_cpus_outside_affinity_mask_are_dropped(self):
+        # CPU 0 is excluded, so its SMT sibling 2 stands in for core 0.
+        self.assertEqual(self._cores(X86_SMT_CPUINFO, {2, 3}), [2, 3])
+        self.assertEqual(self._cores(ARM_CPUINFO, {1, 3}), [1, 3])
+
+    def test_unreadable_cpuinfo_means_unknown(self):
+        with patch("falcon.utils.os.sched_getaffinity", return_value={0, 1}, create=True), \
+                patch("builtins.open", side_effect=OSError("no procfs")):
+            self.assertEqual(get_physical_core_cpus(), [])
+
+if __name__ == '__main__':
+    unittest.main()
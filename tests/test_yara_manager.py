@@ -1,7 +1,10 @@
 
 import unittest
+import pytest
 import os
 import shutil
+import tempfile
+import time
 import yara
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -9,21 +12,47 @@ from unittest.mock import MagicMock, patch
 from falcon.yara_manager import YaraManager
 from falcon.config import ConfigManager
 
+def _write_fixture_rules(rules_dir):
+    (rules_dir / "rule1.yar").write_text("rule test_rule1 { strings: $s1 = \"test_string_1\" condition: $s1 }")
+    (rules_dir / "rule2.yar").write_text("rule test_rule2 { strings: $s2 = \"test_string_2\" condition: $s2 }")
+
+    # Create a sub-directory and a rule file within it
+    (rules_dir / "subdir").mkdir(exist_ok=True)
+    (rules_dir / "subdir" / "rule3.yar").write_text("rule test_rule3 { strings: $s3 = \"test_string_3\" condition: $s3 }")
+
+def _tmp_parent():
+    # tmpfs keeps the per-test rule writes and compiled output in RAM where it is available.
+    return "/dev/shm" if os.path.isdir("/dev/shm") else None
+
 class TestYaraManager(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        # Compile the fixture rules once; each test starts from a copy of the .yarac and its checksum,
+        # so YaraManager takes the yara.load() path unless the test changes the rules.
+        cls._class_tmp = tempfile.TemporaryDirectory(dir=_tmp_parent())
+        canonical_dir = Path(cls._class_tmp.name)
+        _write_fixture_rules(canonical_dir)
+        config = MagicMock(spec=ConfigManager)
+        config.get.side_effect = lambda key: {"rules_dir": str(canonical_dir)}.get(key)
+        manager = YaraManager(config)
+        cls._yarac_path = manager.compiled_rules_path
+        cls._yarac_checksum_path = manager.checksum_path
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._class_tmp.cleanup()
+
     def setUp(self):
-        self.test_rules_dir = Path("test_rules_temp")
-        self.test_rules_dir.mkdir(exist_ok=True)
+        self._tmp = tempfile.TemporaryDirectory(dir=_tmp_parent())
+        self.test_rules_dir = Path(self._tmp.name)
         self.compiled_rules_path = self.test_rules_dir / "compiled_rules.yarac"
         self.checksum_path = self.test_rules_dir / "compiled_rules.yarac.checksum"
 
         # Create dummy YARA rule files
-        (self.test_rules_dir / "rule1.yar").write_text("rule test_rule1 { strings: $s1 = \"test_string_1\" condition: $s1 }")
-        (self.test_rules_dir / "rule2.yar").write_text("rule test_rule2 { strings: $s2 = \"test_string_2\" condition: $s2 }")
-        
-        # Create a sub-directory and a rule file within it
-        (self.test_rules_dir / "subdir").mkdir(exist_ok=True)
-        (self.test_rules_dir / "subdir" / "rule3.yar").write_text("rule test_rule3 { strings: $s3 = \"test_string_3\" condition: $s3 }")
+        _write_fixture_rules(self.test_rules_dir)
+        shutil.copyfile(self._yarac_path, self.compiled_rules_path)
+        shutil.copyfile(self._yarac_checksum_path, self.checksum_path)
 
         # Mock ConfigManager
         self.mock_config_manager = MagicMock(spec=ConfigManager)
@@ -34,23 +63,7 @@ class TestYaraManager(unittest.TestCase):
         self.manager = YaraManager(self.mock_config_manager)
 
     def tearDown(self):
-        if self.test_rules_dir.exists():
-            shutil.rmtree(self.test_rules_dir)
-        if self.compiled_rules_path.exists():
-            os.remove(self.compiled_rules_path)
-        if self.checksum_path.exists():
-            os.remove(self.checksum_path)
-        
-        # Clean up any test files created during scan_file tests
-        if Path("test_file.txt").exists():
-            os.remove("test_file.txt")
-
-    def test_initial_load_and_get_rules(self):
-        self.manager.load_rules()
-        rules = self.manager.get_rules()
-        self.assertIsNotNone(rules)
-        self.assertIsInstance(rules, yara.Rules)
-        self.assertEqual(len(list(rules)), 3)
+        self._tmp.cleanup()
 
     def test_update_rules_detection(self):
         self.manager.load_rules()
@@ -63,18 +76,49 @@ class TestYaraManager(unittest.TestCase):
         
         # Verify new rule is active
         rules = self.manager.get_rules()
-        test_file = Path("test_file.txt")
+        test_file = self.test_rules_dir / "test_file.txt"
         test_file.write_text("This file contains modified_string_1.")
         matches = rules.match(filepath=str(test_file))
         self.assertEqual(len(matches), 1)
         self.assertEqual(matches[0].rule, "test_rule1")
         self.assertEqual(matches[0].strings[0].instances[0].matched_data.decode(), "modified_string_1")
-        test_file.unlink() # Clean up test file
 
-    def test_update_rules_no_change(self):
+    def test_update_check_skips_hashing_when_unchanged(self):
         self.manager.load_rules()
-        reloaded = self.manager.check_for_updates_and_reload()
-        self.assertFalse(reloaded)
+        with patch.object(self.manager, "_calculate_rules_checksum") as mock_checksum:
+            self.assertFalse(self.manager.check_for_updates_and_reload())
+            mock_checksum.assert_not_called()
+
+    def test_update_rules_detection_yara_extension(self):
+        self.manager.load_rules()
+        (self.test_rules_dir / "rule4.yara").write_text("rule test_rule4 { strings: $s4 = \"test_string_4\" condition: $s4 }")
+        self.assertTrue(self.manager.check_for_updates_and_reload())
+        self.assertEqual(self.manager.rule_count, 4)
+
+    def test_watcher_ignores_rule_reads(self):
+        pytest.importorskip("watchdog")
+        with patch.object(self.manager, "_schedule_reload") as mock_schedule:
+            self.assertTrue(self.manager.start_watching())
+            self.addCleanup(self.manager.stop_watching)
+            (self.test_rules_dir / "rule1.yar").read_text()
+            time.sleep(0.2)
+            mock_schedule.assert_not_called()
+
+            (self.test_rules_dir / "rule4.yar").write_text("rule test_rule4 { strings: $s4 = \"test_string_4\" condition: $s4 }")
+            deadline = time.monotonic() + 2.0
+            while not mock_schedule.called and time.monotonic() < deadline:
+                time.sleep(0.02)
+            mock_schedule.assert_called()
+
+    def test_oversized_rule_file_skipped(self):
+        (self.test_rules_dir / "huge.yar").write_text("rule huge_rule { strings: $h = \"" + "h" * 200 + "\" condition: $h }")
+        config = MagicMock(spec=ConfigManager)
+        config.get.side_effect = lambda key: {
+            "rules_dir": str(self.test_rules_dir),
+            "max_rule_file_size_mb": 150 / (1024 * 1024),
+        }.get(key)
+        manager = YaraManager(config)
+        self.assertEqual(sorted(r.identifier for r in manager.get_rules()), ["test_rule1", "test_rule2", "test_rule3"])
 
     def test_empty_rules_directory(self):
         shutil.rmtree(self.test_rules_dir)
@@ -85,22 +129,66 @@ class TestYaraManager(unittest.TestCase):
         self.assertIsNone(manager.get_rules())
 
     def test_invalid_rule_syntax(self):
-        (self.test_rules_dir / "bad_rule.yar").write_text("rule bad_rule { strings: $a = \"bad\" condition: $a and }") # Syntax error
-        # Re-initialize manager to pick up new bad rule
-        manager = YaraManager(self.mock_config_manager)
-        manager.load_rules()
-        self.assertIsNone(manager.get_rules())
+        # Only the error branch is under test, so have yara.compile fail outright.
+        with patch("falcon.yara_manager.yara.compile", side_effect=yara.SyntaxError("bad")) as mock_compile:
+            self.manager.load_rules(force_recompile=True)
+        mock_compile.assert_called_once()
+        self.assertIsNone(self.manager.get_rules())
 
-    def test_compiled_rules_persistence(self):
-        self.manager.load_rules() # This should create compiled_rules.yarac
-        self.assertTrue(self.compiled_rules_path.exists())
+    def test_rule_prefilter_hints(self):
+        self.manager.load_rules()
+        self.assertFalse(self.manager.get_rule_snapshot()[1])
 
-        # Create a new manager instance to test loading from compiled file
-        new_manager = YaraManager(self.mock_config_manager)
-        new_manager.load_rules()
-        rules = new_manager.get_rules()
-        self.assertIsNotNone(rules)
-        self.assertEqual(len(list(rules)), 3)
+        shutil.rmtree(self.test_rules_dir)
+        self.test_rules_dir.mkdir(exist_ok=True)
+        (self.test_rules_dir / "pe_rule.yar").write_text(
+            "rule pe_rule { meta: max_filesize = 1024 magic = \"4D5A\" strings: $a = \"evil\" condition: $a }"
+        )
+        (self.test_rules_dir / "small_rule.yar").write_text(
+            "rule small_rule { meta: max_filesize = 16 strings: $a = \"tiny\" condition: $a }"
+        )
+        manager = YaraManager(self.mock_config_manager)
+        rules, prefilter = manager.get_rule_snapshot()
+        self.assertIs(rules, manager.get_rules())
+        self.assertTrue(prefilter)
+        self.assertEqual(prefilter.header_size, 2)
+        self.assertEqual(prefilter.applicable_rules(10, b"MZ"), {"pe_rule", "small_rule"})
+        self.assertEqual(prefilter.applicable_rules(100, b"MZ"), {"pe_rule"})
+        self.assertEqual(prefilter.applicable_rules(100, b"\x7fE"), set())
+        self.assertEqual(prefilter.applicable_rules(2048, b"MZ"), set())
+        self.assertTrue(prefilter.any_applicable(100, b"MZ"))
+        self.assertTrue(prefilter.any_applicable(10, b"\x7fE"))
+        self.assertFalse(prefilter.any_applicable(100, b"\x7fE"))
+        self.assertFalse(prefilter.any_applicable(2048, b"MZ"))
+
+
+@pytest.fixture(scope="module")
+def loaded_manager(tmp_path_factory):
+    # Shared by the tests that only read the loaded fixture rules, so they compile once between them.
+    rules_dir = tmp_path_factory.mktemp("rules")
+    _write_fixture_rules(rules_dir)
+    config = MagicMock(spec=ConfigManager)
+    config.get.side_effect = lambda key: {"rules_dir": str(rules_dir)}.get(key)
+    return YaraManager(config)
+
+def test_initial_load_and_get_rules(loaded_manager):
+    loaded_manager.load_rules()
+    rules = loaded_manager.get_rules()
+    assert rules is not None
+    assert isinstance(rules, yara.Rules)
+    assert loaded_manager.rule_count == 3
+
+def test_update_rules_no_change(loaded_manager):
+    assert loaded_manager.check_for_updates_and_reload() is False
+
+def test_compiled_rules_persistence(loaded_manager):
+    assert loaded_manager.compiled_rules_path.exists()
+
+    # Create a new manager instance to test loading from compiled file
+    new_manager = YaraManager(loaded_manager.config)
+    new_manager.load_rules()
+    assert new_manager.get_rules() is not None
+    assert new_manager.rule_count == 3
 
 if __name__ == '__main__':
     unittest.main()